@@ -1,26 +1,50 @@
 import streamlit as st
-from datetime import datetime
-from main_certificate_system import DataWipingCertificationSystem
+import time
 import hashlib
 import json
 
+try:
+    from wipe_data_schema import decode_wipe_data
+except ImportError:  # msgspec is optional
+    decode_wipe_data = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib json
+    orjson = None
+
 # --- Page Configuration ---
 st.set_page_config(page_title="DESTROYER Certification", layout="wide")
 
 
+_CHUNK_SIZE = 1 << 20
+
+
 def calculate_sha256(file_object):
-    sha256_hash = hashlib.sha256()
+    # Streamlit ka UploadedFile pehle se memory mein hai, ek hi call mein hash
+    if hasattr(file_object, 'getvalue'):
+        return hashlib.sha256(file_object.getvalue()).hexdigest()
+
     file_object.seek(0) # File ko shuruaat se padhna sunishchit karein
-    for byte_block in iter(lambda: file_object.read(4096), b""):
-        sha256_hash.update(byte_block)
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(file_object, 'sha256').hexdigest()
+
+    # Python < 3.11: 1 MiB chunks, ek hi buffer reuse karke
+    sha256_hash = hashlib.sha256()
+    buffer = memoryview(bytearray(_CHUNK_SIZE))
+    while True:
+        n = file_object.readinto(buffer)
+        if not n:
+            break
+        sha256_hash.update(buffer[:n])
     return sha256_hash.hexdigest()
 
 @st.cache_resource
 def get_cert_system():
+    # Heavy import (web3, reportlab) tabhi jab pehli baar zaroorat ho
+    from main_certificate_system import DataWipingCertificationSystem
     return DataWipingCertificationSystem()
 
-cert_system = get_cert_system()
-
 # --- UI SETUP ---
 st.sidebar.image("logo.png", width=100) 
 st.sidebar.title("DESTROYER Portal")
@@ -61,16 +85,18 @@ if page == "Admin Panel (Issue Certificate)":
             else:
                 log_hash = calculate_sha256(uploaded_log_file)
                 st.info(f"Calculated Unique Log Hash: {log_hash}")
-                certificate_id = f"cert_{device_serial}_{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+                # Ek hi UTC timestamp ID aur timestamp_utc dono ke liye
+                ts_id = time.strftime('%Y%m%dT%H%M%S', time.gmtime())
+                certificate_id = f"cert_{device_serial}_{ts_id}"
                 wipe_data = {
                     "device_details": { "serial": device_serial, "model": device_model },
-                    "wipe_mode": wipe_method, "timestamp_utc": datetime.utcnow().strftime("%Y%m%dT%H%M%SZ"),
+                    "wipe_mode": wipe_method, "timestamp_utc": ts_id + "Z",
                     "success": True, "system_info": {"hostname": "WebApp-Manual"}, "tool_version": "N/A",
                     "verification": {"log_hash_sha256": log_hash}, "certificate_id": certificate_id, "status": "Success"
                 }
 
                 with st.spinner('Processing...'):
-                    result = cert_system.process_wipe_data(wipe_data)
+                    result = get_cert_system().process_wipe_data(wipe_data)
                     if result['success']:
                         st.success("Certificate Issued via Manual Form!")
                         st.balloons()
@@ -87,12 +113,18 @@ if page == "Admin Panel (Issue Certificate)":
             if uploaded_json_file is not None:
                 try:
                     # JSON file ko read aur parse karna
-                    wipe_data_from_json = json.load(uploaded_json_file)
+                    if decode_wipe_data is not None:
+                        # Parse aur schema validation ek hi pass mein
+                        wipe_data_from_json = decode_wipe_data(uploaded_json_file.getvalue())
+                    elif orjson is not None:
+                        wipe_data_from_json = orjson.loads(uploaded_json_file.getvalue())
+                    else:
+                        wipe_data_from_json = json.load(uploaded_json_file)
                     st.write("✅ JSON file read successfully. Issuing certificate with this data:")
                     st.json(wipe_data_from_json)
 
                     with st.spinner('Processing JSON... Issuing certificate...'):
-                        result = cert_system.process_wipe_data(wipe_data_from_json)
+                        result = get_cert_system().process_wipe_data(wipe_data_from_json)
                         if result['success']:
                             st.success("Certificate Issued from JSON file!")
                             st.balloons()
@@ -120,7 +152,7 @@ elif page == "User Panel (Verify Certificate)":
             st.warning("Please enter a Certificate ID.")
         else:
             with st.spinner("Blockchain se data laaya jaa raha hai..."):
-                details = cert_system.get_certificate_details(cert_id_to_verify)
+                details = get_cert_system().get_certificate_details(cert_id_to_verify)
                 if details['success']:
                     cert_data = details['certificate_details']
                     if cert_data['is_valid']:
@@ -1,15 +1,216 @@
 import os
 import json
+import time
+import functools
+import threading
 import hashlib
-import requests
-from web3 import Web3
+import ssl
 from dotenv import load_dotenv
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib json
+    orjson = None
+
+# web3 and requests are imported lazily inside the functions that use them,
+# they dominate import time and the Streamlit UI should render without them
+
 load_dotenv()
 
+CONTRACT_BUILD_PATH = 'build/contracts/DataWipingCertificate.json'
+
+# Fallback ABI if truffle build not available
+_FALLBACK_ABI = [
+    {
+        "inputs": [
+            {"name": "_certificateId", "type": "string"},
+            {"name": "_devicePath", "type": "string"},
+            {"name": "_deviceModel", "type": "string"},
+            {"name": "_deviceSerial", "type": "string"},
+            {"name": "_wipeMethod", "type": "string"},
+            {"name": "_timestamp", "type": "string"},
+            {"name": "_systemHostname", "type": "string"},
+            {"name": "_toolVersion", "type": "string"},
+            {"name": "_logHash", "type": "string"},
+            {"name": "_ipfsHash", "type": "string"}
+        ],
+        "name": "issueCertificate",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "_certificateId", "type": "string"}],
+        "name": "verifyCertificate",
+        "outputs": [
+            {"name": "exists", "type": "bool"},
+            {"name": "isValid", "type": "bool"},
+            {"name": "deviceSerial", "type": "string"},
+            {"name": "wipeMethod", "type": "string"},
+            {"name": "timestamp", "type": "string"},
+            {"name": "ipfsHash", "type": "string"},
+            {"name": "issuer", "type": "address"},
+            {"name": "createdAt", "type": "uint256"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "_certificateId", "type": "string"}],
+        "name": "getCertificateDetails",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "certificateId", "type": "string"},
+                    {"name": "devicePath", "type": "string"},
+                    {"name": "deviceModel", "type": "string"},
+                    {"name": "deviceSerial", "type": "string"},
+                    {"name": "wipeMethod", "type": "string"},
+                    {"name": "timestamp", "type": "string"},
+                    {"name": "systemHostname", "type": "string"},
+                    {"name": "toolVersion", "type": "string"},
+                    {"name": "logHash", "type": "string"},
+                    {"name": "ipfsHash", "type": "string"},
+                    {"name": "issuer", "type": "address"},
+                    {"name": "createdAt", "type": "uint256"},
+                    {"name": "isValid", "type": "bool"}
+                ],
+                "name": "",
+                "type": "tuple"
+            }
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# Pinata options are the same for every upload, serialized once
+_PINATA_OPTIONS = json.dumps({'cidVersion': 1})
+
+# Seconds a fetched gas price is reused before polling the node again
+GAS_PRICE_TTL = 5
+
+# Calls per JSON-RPC batch; hosted providers reject oversized batches
+MAX_RPC_BATCH = int(os.getenv('MAX_RPC_BATCH', '20'))
+
+# Multicall3 is deployed at the same address on mainnet and most L2s/testnets
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+_MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+@functools.lru_cache(maxsize=1)
+def _load_abi(path=CONTRACT_BUILD_PATH):
+    """Load the contract ABI from the truffle build, once per process"""
+    try:
+        with open(path, 'rb') as f:
+            contract_json = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        return contract_json['abi']
+    except FileNotFoundError:
+        return _FALLBACK_ABI
+
+# Process-wide factories so every BlockchainIntegration (Streamlit reruns,
+# Flask workers, tests) shares one provider, contract and connection pool
+
+@functools.lru_cache(maxsize=None)
+def _rpc_session(rpc_url):
+    """Return the keep-alive HTTP session for JSON-RPC calls to rpc_url"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    # Pool sized for the batched / threaded RPC calls made during issuance
+    # and for the concurrent lookups of a gevent web worker
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _new_web3(rpc_url):
+    """Return a Web3 instance with its own provider on the shared session"""
+    from web3 import Web3
+    
+    provider = Web3.HTTPProvider(rpc_url, session=_rpc_session(rpc_url), request_kwargs={'timeout': 30})
+    return Web3(provider)
+
+def _shared_batch_requests():
+    """Stand-in for batch_requests() on the shared Web3"""
+    raise RuntimeError("JSON-RPC batches must use a private _new_web3() instance, not the shared Web3")
+
+@functools.lru_cache(maxsize=None)
+def _connect_web3(rpc_url):
+    """Return a connected Web3 instance and its chain id"""
+    web3 = _new_web3(rpc_url)
+    
+    # This instance is used by every thread of the process, and web3.py flags
+    # batching on the provider, so a batch opened here would capture other
+    # threads' calls; batches go through _new_web3() instead
+    if hasattr(web3, 'batch_requests'):
+        web3.batch_requests = _shared_batch_requests
+    
+    if not web3.is_connected():
+        raise ConnectionError("Cannot connect to Ethereum network")
+    
+    return web3, web3.eth.chain_id
+
+@functools.lru_cache(maxsize=None)
+def _load_contract(rpc_url, contract_address):
+    """Return the contract bound to the shared Web3 instance"""
+    web3, _ = _connect_web3(rpc_url)
+    return web3.eth.contract(address=contract_address, abi=_load_abi())
+
+@functools.lru_cache(maxsize=None)
+def _pinata_session(api_key, secret):
+    """Return a keep-alive session for Pinata uploads"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.headers.update({
+        'pinata_api_key': api_key or '',
+        'pinata_secret_api_key': secret or ''
+    })
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
 class BlockchainIntegration:
     def __init__(self):
+        self._gas_price_cache = (0.0, 0)
+        self._nonce = None
+        self._nonce_lock = threading.Lock()
+        self._multicall = None
         self.setup_logging()
         self.setup_web3()
         self.setup_ipfs()
@@ -19,6 +220,8 @@ class BlockchainIntegration:
         """Setup logging configuration"""
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
+        # hashlib's SHA-256 speed depends on the linked OpenSSL build (SHA-NI)
+        self.logger.info("Hashing backend: %s", ssl.OPENSSL_VERSION)
     
     def setup_web3(self):
         """Initialize Web3 connection"""
@@ -28,13 +231,10 @@ class BlockchainIntegration:
         if not self.private_key:
             raise ValueError("PRIVATE_KEY not found in environment variables")
         
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        
-        if not self.web3.is_connected():
-            raise ConnectionError("Cannot connect to Ethereum network")
+        self.web3, self.chain_id = _connect_web3(self.rpc_url)
         
         self.account = self.web3.eth.account.from_key(self.private_key)
-        self.logger.info(f"Connected to blockchain. Account: {self.account.address}")
+        self.logger.info("Connected to blockchain. Account: %s", self.account.address)
     
     def setup_ipfs(self):
         """Setup IPFS configuration"""
@@ -43,6 +243,9 @@ class BlockchainIntegration:
         
         if not all([self.pinata_api_key, self.pinata_secret]):
             self.logger.warning("Pinata credentials not found. IPFS upload will be disabled.")
+        
+        # Reuse one keep-alive connection pool for all Pinata uploads
+        self._http = _pinata_session(self.pinata_api_key, self.pinata_secret)
     
     def load_contract(self):
         """Load the deployed contract"""
@@ -51,82 +254,23 @@ class BlockchainIntegration:
         if not contract_address:
             raise ValueError("CONTRACT_ADDRESS not found in environment variables")
         
-        # Load contract ABI from truffle build
-        try:
-            with open('build/contracts/DataWipingCertificate.json', 'r') as f:
-                contract_json = json.load(f)
-                self.contract_abi = contract_json['abi']
-        except FileNotFoundError:
-            # Fallback ABI if truffle build not available
-            self.contract_abi = [
-                {
-                    "inputs": [
-                        {"name": "_certificateId", "type": "string"},
-                        {"name": "_devicePath", "type": "string"},
-                        {"name": "_deviceModel", "type": "string"},
-                        {"name": "_deviceSerial", "type": "string"},
-                        {"name": "_wipeMethod", "type": "string"},
-                        {"name": "_timestamp", "type": "string"},
-                        {"name": "_systemHostname", "type": "string"},
-                        {"name": "_toolVersion", "type": "string"},
-                        {"name": "_logHash", "type": "string"},
-                        {"name": "_ipfsHash", "type": "string"}
-                    ],
-                    "name": "issueCertificate",
-                    "outputs": [],
-                    "stateMutability": "nonpayable",
-                    "type": "function"
-                },
-                {
-                    "inputs": [{"name": "_certificateId", "type": "string"}],
-                    "name": "verifyCertificate",
-                    "outputs": [
-                        {"name": "exists", "type": "bool"},
-                        {"name": "isValid", "type": "bool"},
-                        {"name": "deviceSerial", "type": "string"},
-                        {"name": "wipeMethod", "type": "string"},
-                        {"name": "timestamp", "type": "string"},
-                        {"name": "ipfsHash", "type": "string"},
-                        {"name": "issuer", "type": "address"},
-                        {"name": "createdAt", "type": "uint256"}
-                    ],
-                    "stateMutability": "view",
-                    "type": "function"
-                },
-                {
-                    "inputs": [{"name": "_certificateId", "type": "string"}],
-                    "name": "getCertificateDetails",
-                    "outputs": [
-                        {
-                            "components": [
-                                {"name": "certificateId", "type": "string"},
-                                {"name": "devicePath", "type": "string"},
-                                {"name": "deviceModel", "type": "string"},
-                                {"name": "deviceSerial", "type": "string"},
-                                {"name": "wipeMethod", "type": "string"},
-                                {"name": "timestamp", "type": "string"},
-                                {"name": "systemHostname", "type": "string"},
-                                {"name": "toolVersion", "type": "string"},
-                                {"name": "logHash", "type": "string"},
-                                {"name": "ipfsHash", "type": "string"},
-                                {"name": "issuer", "type": "address"},
-                                {"name": "createdAt", "type": "uint256"},
-                                {"name": "isValid", "type": "bool"}
-                            ],
-                            "name": "",
-                            "type": "tuple"
-                        }
-                    ],
-                    "stateMutability": "view",
-                    "type": "function"
-                }
-            ]
+        self.contract_abi = _load_abi()
+        self.contract = _load_contract(self.rpc_url, contract_address)
         
-        self.contract = self.web3.eth.contract(
-            address=contract_address,
-            abi=self.contract_abi
+        from eth_utils.abi import (
+            function_abi_to_4byte_selector,
+            get_abi_input_types,
+            get_abi_output_types
         )
-        self.logger.info(f"Contract loaded at: {contract_address}")
+        
+        # Resolve ABI entries once instead of walking the ABI on every call
+        self._fn_issue = self.contract.get_function_by_name('issueCertificate')
+        self._fn_verify = self.contract.get_function_by_name('verifyCertificate')
+        self._fn_details = self.contract.get_function_by_name('getCertificateDetails')
+        self._issue_selector = function_abi_to_4byte_selector(self._fn_issue.abi)
+        self._issue_input_types = get_abi_input_types(self._fn_issue.abi)
+        self._details_output_types = get_abi_output_types(self._fn_details.abi)
+        self.logger.info("Contract loaded at: %s", contract_address)
     
     def upload_to_ipfs(self, file_path, metadata=None):
         """Upload file to IPFS using Pinata"""
@@ -135,67 +279,127 @@ class BlockchainIntegration:
             return None
         
         url = "https://api.pinata.cloud/pinning/pinFileToIPFS"
-        headers = {
-            'pinata_api_key': self.pinata_api_key,
-            'pinata_secret_api_key': self.pinata_secret
-        }
+        
+        try:
+            from requests_toolbelt import MultipartEncoder
+        except ImportError:  # without requests-toolbelt the body is built in memory
+            MultipartEncoder = None
         
         try:
             with open(file_path, 'rb') as file:
-                files = {'file': (os.path.basename(file_path), file, 'application/pdf')}
+                fields = {'file': (os.path.basename(file_path), file, 'application/pdf')}
                 
                 data = {}
                 if metadata:
-                    data['pinataMetadata'] = json.dumps(metadata)
-                    data['pinataOptions'] = json.dumps({'cidVersion': 1})
+                    data['pinataMetadata'] = orjson.dumps(metadata) if orjson is not None else json.dumps(metadata)
+                    data['pinataOptions'] = _PINATA_OPTIONS
                 
-                response = requests.post(url, files=files, headers=headers, data=data)
+                if MultipartEncoder is not None:
+                    # Stream the file from disk instead of buffering the whole body
+                    encoder = MultipartEncoder(fields={**fields, **data})
+                    response = self._http.post(
+                        url, data=encoder, headers={'Content-Type': encoder.content_type}, timeout=30
+                    )
+                else:
+                    response = self._http.post(url, files=fields, data=data, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
                 ipfs_hash = result['IpfsHash']
-                self.logger.info(f"File uploaded to IPFS: {ipfs_hash}")
+                self.logger.info("File uploaded to IPFS: %s", ipfs_hash)
                 return ipfs_hash
             else:
-                self.logger.error(f"IPFS upload failed: {response.status_code} - {response.text}")
+                self.logger.error("IPFS upload failed: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            self.logger.error(f"IPFS upload error: {e}")
+            self.logger.error("IPFS upload error: %s", e)
             return None
     
     def calculate_data_hash(self, data):
         """Calculate SHA-256 hash of the data"""
         if isinstance(data, dict):
-            data_string = json.dumps(data, sort_keys=True)
+            # Compact, sorted UTF-8 so both serializers give identical bytes
+            if orjson is not None:
+                data_bytes = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+            else:
+                data_bytes = json.dumps(
+                    data, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+                ).encode()
         else:
-            data_string = str(data)
-        return hashlib.sha256(data_string.encode()).hexdigest()
+            data_bytes = str(data).encode()
+        return hashlib.sha256(data_bytes).hexdigest()
     
-    def estimate_gas_cost(self, function_call):
+    def _cached_gas_price(self):
+        """Return the cached gas price if it is still fresh, else None"""
+        fetched_at, gas_price = self._gas_price_cache
+        if gas_price and time.monotonic() - fetched_at < GAS_PRICE_TTL:
+            return gas_price
+        return None
+    
+    def fetch_account_state(self):
+        """Fetch gas price and balance, in a single JSON-RPC batch when not cached"""
+        address = self.account.address
+        gas_price = self._cached_gas_price()
+        
+        if gas_price is not None:
+            return gas_price, self.web3.eth.get_balance(address)
+        
+        gas_price = balance = None
+        if hasattr(self.web3, 'batch_requests'):
+            # Private provider, a batch on the shared one captures other threads' calls
+            batch_web3 = _new_web3(self.rpc_url)
+            try:
+                with batch_web3.batch_requests() as batch:
+                    batch.add(batch_web3.eth.gas_price)
+                    batch.add(batch_web3.eth.get_balance(address))
+                    gas_price, balance = batch.execute()
+            except Exception as e:
+                # Some nodes reject JSON-RPC batches
+                self.logger.warning("Batched account state fetch failed, retrying singly: %s", e)
+        
+        if gas_price is None:
+            gas_price = self.web3.eth.gas_price
+            balance = self.web3.eth.get_balance(address)
+        
+        self._gas_price_cache = (time.monotonic(), gas_price)
+        return gas_price, balance
+    
+    def _next_nonce(self):
+        """Nonce for the next transaction; call with _nonce_lock held"""
+        nonce = self.web3.eth.get_transaction_count(self.account.address, 'pending')
+        
+        # Never reuse a nonce already sent from this instance
+        if self._nonce is not None:
+            nonce = max(nonce, self._nonce + 1)
+        return nonce
+    
+    def estimate_gas_cost(self, transaction, gas_price=None):
         """Estimate gas cost for transaction"""
         try:
-            gas_estimate = function_call.estimate_gas({'from': self.account.address})
-            gas_price = self.web3.eth.gas_price
+            gas_estimate = self.web3.eth.estimate_gas(transaction)
+            if gas_price is None:
+                gas_price = self.web3.eth.gas_price
             cost_wei = gas_estimate * gas_price
             cost_eth = self.web3.from_wei(cost_wei, 'ether')
             
-            self.logger.info(f"Estimated gas: {gas_estimate}, Cost: {cost_eth} ETH")
+            self.logger.info("Estimated gas: %s, Cost: %s ETH", gas_estimate, cost_eth)
             return gas_estimate, cost_eth
         except Exception as e:
-            self.logger.error(f"Gas estimation failed: {e}")
+            self.logger.error("Gas estimation failed: %s", e)
             return None, None
     
-    def issue_certificate(self, wipe_data, ipfs_hash):
+    def issue_certificate(self, wipe_data, ipfs_hash, account_state=None):
         """Issue certificate on blockchain"""
+        certificate_id = wipe_data.get('certificate_id', '')
+        
         try:
-            certificate_id = wipe_data.get('certificate_id', '')
             device_details = wipe_data.get('device_details', {})
             system_info = wipe_data.get('system_info', {})
             verification = wipe_data.get('verification', {})
             
-            # Prepare function call
-            function_call = self.contract.functions.issueCertificate(
+            # Encode calldata once, reused for gas estimation and the signed tx
+            data = self._issue_selector + self.web3.codec.encode(self._issue_input_types, [
                 certificate_id,
                 device_details.get('path', ''),
                 device_details.get('model', ''),
@@ -206,87 +410,178 @@ class BlockchainIntegration:
                 wipe_data.get('tool_version', ''),
                 verification.get('log_hash_sha256', ''),
                 ipfs_hash or ''
-            )
+            ])
+            transaction = {
+                'from': self.account.address,
+                'to': self.contract.address,
+                'data': '0x' + data.hex(),
+                'chainId': self.chain_id
+            }
+            
+            # Gas price and balance in one round-trip (unless prefetched)
+            gas_price, balance = account_state or self.fetch_account_state()
             
             # Estimate gas
-            gas_estimate, cost_eth = self.estimate_gas_cost(function_call)
+            gas_estimate, cost_eth = self.estimate_gas_cost(transaction, gas_price)
             if not gas_estimate:
                 raise Exception("Cannot estimate gas cost")
             
             # Check balance
-            balance = self.web3.eth.get_balance(self.account.address)
             balance_eth = self.web3.from_wei(balance, 'ether')
             
             if balance_eth < cost_eth:
                 raise Exception(f"Insufficient balance. Need {cost_eth} ETH, have {balance_eth} ETH")
             
             # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.account.address)
-            transaction = function_call.build_transaction({
-                'from': self.account.address,
+            transaction.update({
                 'gas': gas_estimate + 50000,  # Add buffer
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': nonce
+                'gasPrice': gas_price
             })
             
-            # Sign and send transaction
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, self.private_key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            # Take the nonce, sign and send under one lock so concurrent
+            # issuances from this instance never sign with the same nonce
+            with self._nonce_lock:
+                transaction['nonce'] = self._next_nonce()
+                signed_txn = self.web3.eth.account.sign_transaction(transaction, self.private_key)
+                tx_hash = self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                self._nonce = transaction['nonce']
             
-            self.logger.info(f"Certificate issuance transaction sent: {tx_hash.hex()}")
+            self.logger.info("Certificate issuance transaction sent: %s", tx_hash.to_0x_hex())
             
             # Wait for confirmation
             receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
             
             if receipt.status == 1:
-                self.logger.info(f"Certificate issued successfully. Block: {receipt.blockNumber}")
+                self.logger.info("Certificate issued successfully. Block: %s", receipt.blockNumber)
                 return receipt
             else:
                 raise Exception("Transaction failed")
                 
         except Exception as e:
-            self.logger.error(f"Certificate issuance failed: {e}")
+            # Resync the nonce from the node on the next issuance
+            with self._nonce_lock:
+                self._nonce = None
+            self.logger.error("Certificate issuance failed: %s", e)
             raise
     
     def verify_certificate(self, certificate_id):
         """Verify certificate on blockchain"""
         try:
-            result = self.contract.functions.verifyCertificate(certificate_id).call()
-            
-            return {
-                'exists': result[0],
-                'is_valid': result[1],
-                'device_serial': result[2],
-                'wipe_method': result[3],
-                'timestamp': result[4],
-                'ipfs_hash': result[5],
-                'issuer': result[6],
-                'created_at': result[7]
-            }
+            result = self._fn_verify(certificate_id).call()
+            return self._format_verification(result)
         except Exception as e:
-            self.logger.error(f"Certificate verification failed: {e}")
+            self.logger.error("Certificate verification failed: %s", e)
             return None
     
+    def _format_verification(self, result):
+        """Map the verifyCertificate tuple to a dict"""
+        return {
+            'exists': result[0],
+            'is_valid': result[1],
+            'device_serial': result[2],
+            'wipe_method': result[3],
+            'timestamp': result[4],
+            'ipfs_hash': result[5],
+            'issuer': result[6],
+            'created_at': result[7]
+        }
+    
+    def verify_certificates_batch(self, certificate_ids):
+        """Verify many certificates in JSON-RPC batches of MAX_RPC_BATCH calls"""
+        if not hasattr(self.web3, 'batch_requests'):
+            return [self.verify_certificate(cid) for cid in certificate_ids]
+        
+        # web3.py marks the provider itself as batching, so a batch opened on
+        # the shared instance would capture other threads' calls; batch on a
+        # private provider (same connection pool) instead
+        batch_web3 = _new_web3(self.rpc_url)
+        fn_verify = batch_web3.eth.contract(
+            address=self.contract.address, abi=self.contract_abi
+        ).get_function_by_name('verifyCertificate')
+        
+        results = []
+        for start in range(0, len(certificate_ids), MAX_RPC_BATCH):
+            chunk = certificate_ids[start:start + MAX_RPC_BATCH]
+            try:
+                with batch_web3.batch_requests() as batch:
+                    for cid in chunk:
+                        batch.add(fn_verify(cid))
+                    responses = batch.execute()
+            except Exception as e:
+                # A single failing call fails the whole batch, retry one by one
+                self.logger.warning("Batched verification failed, retrying singly: %s", e)
+                results.extend(self.verify_certificate(cid) for cid in chunk)
+                continue
+            results.extend(self._format_verification(result) for result in responses)
+        return results
+    
+    def _format_certificate_details(self, result):
+        """Map the getCertificateDetails tuple to a dict"""
+        return {
+            'certificate_id': result[0],
+            'device_path': result[1],
+            'device_model': result[2],
+            'device_serial': result[3],
+            'wipe_method': result[4],
+            'timestamp': result[5],
+            'system_hostname': result[6],
+            'tool_version': result[7],
+            'log_hash': result[8],
+            'ipfs_hash': result[9],
+            'issuer': result[10],
+            'created_at': result[11],
+            'is_valid': result[12]
+        }
+    
     def get_certificate_details(self, certificate_id):
         """Get full certificate details from blockchain"""
+        from web3.exceptions import ContractLogicError
+        
         try:
-            result = self.contract.functions.getCertificateDetails(certificate_id).call()
-            
-            return {
-                'certificate_id': result[0],
-                'device_path': result[1],
-                'device_model': result[2],
-                'device_serial': result[3],
-                'wipe_method': result[4],
-                'timestamp': result[5],
-                'system_hostname': result[6],
-                'tool_version': result[7],
-                'log_hash': result[8],
-                'ipfs_hash': result[9],
-                'issuer': result[10],
-                'created_at': result[11],
-                'is_valid': result[12]
-            }
+            result = self._fn_details(certificate_id).call()
+            return self._format_certificate_details(result)
+        except ContractLogicError:
+            # getCertificateDetails reverts for unknown ids
+            return None
+    
+    def _get_multicall(self):
+        """Return the Multicall3 contract, or None if it is not deployed on this chain"""
+        if self._multicall is None:
+            if self.web3.eth.get_code(MULTICALL3_ADDRESS):
+                self._multicall = self.web3.eth.contract(address=MULTICALL3_ADDRESS, abi=_MULTICALL3_ABI)
+            else:
+                self._multicall = False
+        return self._multicall or None
+    
+    def get_certificate_details_batch(self, certificate_ids):
+        """Get details for many certificates in one eth_call via Multicall3; None for unknown ids"""
+        from eth_utils import to_checksum_address
+        
+        try:
+            multicall = self._get_multicall()
         except Exception as e:
-            self.logger.error(f"Failed to get certificate details: {e}")
-            return None
\ No newline at end of file
+            self.logger.error("Multicall3 lookup failed: %s", e)
+            multicall = None
+        
+        if multicall is None:
+            # e.g. a local Ganache chain without Multicall3
+            return [self.get_certificate_details(cid) for cid in certificate_ids]
+        
+        calls = [
+            (self.contract.address, True, self.contract.encode_abi('getCertificateDetails', args=[cid]))
+            for cid in certificate_ids
+        ]
+        responses = multicall.functions.aggregate3(calls).call()
+        
+        details = []
+        for success, return_data in responses:
+            if success:
+                result = self.web3.codec.decode(self._details_output_types, return_data)[0]
+                formatted = self._format_certificate_details(result)
+                # Raw codec output skips web3's normalizers, match .call()
+                formatted['issuer'] = to_checksum_address(formatted['issuer'])
+                details.append(formatted)
+            else:
+                # getCertificateDetails reverts for unknown ids
+                details.append(None)
+        return details
\ No newline at end of file
@@ -1,210 +1,226 @@
-import os
+import functools
 import json
 import hashlib
-import qrcode
 from datetime import datetime
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.barcode.qr import QrCodeWidget
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.lib.colors import HexColor
-import requests
-from web3 import Web3
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Styles are immutable once built, so they are created once per process
+_STYLES = getSampleStyleSheet()
+
+# Custom title style
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Title'],
+    fontSize=24,
+    textColor=colors.darkblue,
+    alignment=TA_CENTER,
+    spaceAfter=20,
+    fontName='Helvetica-Bold'
+)
+
+# Custom subtitle style
+_SUBTITLE_STYLE = ParagraphStyle(
+    'CustomSubtitle',
+    parent=_STYLES['Normal'],
+    fontSize=16,
+    textColor=colors.grey,
+    alignment=TA_CENTER,
+    spaceAfter=15,
+    fontName='Helvetica-Bold'
+)
+
+# Custom section header style
+_SECTION_STYLE = ParagraphStyle(
+    'SectionHeader',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.darkblue,
+    spaceBefore=15,
+    spaceAfter=10,
+    fontName='Helvetica-Bold'
+)
+
+# Custom normal style
+_NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal',
+    parent=_STYLES['Normal'],
+    fontSize=11,
+    textColor=colors.black,
+    spaceAfter=6,
+    fontName='Helvetica'
+)
+
+_COL_WIDTHS = [2.5*inch, 4*inch]
+
+# Certificate introduction paragraph
+_INTRO_TEXT = """
+This certificate verifies that secure data sanitization has been performed on the specified 
+storage device in accordance with industry standards and best practices for IT asset recycling. 
+The wiping process has been completed successfully and verified through cryptographic hashing.
+"""
+
+# Markup for one entry of the command execution section
+_CMD_TEMPLATE = (
+    "<b>Command {index}:</b> {cmd}<br/>"
+    "<b>Return Code:</b> {returncode}<br/>"
+    "<b>Output:</b> {stdout}{ellipsis}"
+)
+
+# Rows per details section (device, wipe, system, verification); the
+# sections share one Table separated by blank spacer rows
+_SECTION_ROWS = (7, 6, 3, 4)
+_SECTION_COLOURS = (
+    ('#E8F4FD', '#4472C4'),
+    ('#E8F5E8', '#70AD47'),
+    ('#FDF2E9', '#E67E22'),
+    ('#FDE7F3', '#E91E63'),
+)
+_SECTION_GAP = 15
+
+def _details_table_layout():
+    """Row heights and style for the combined details table"""
+    commands = [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]
+    row_heights = []
+    first = 0
+    for rows, (label_bg, header_bg) in zip(_SECTION_ROWS, _SECTION_COLOURS):
+        if first:
+            # Blank spacer row between sections
+            row_heights.append(_SECTION_GAP)
+            first += 1
+        last = first + rows - 1
+        commands += [
+            ('BACKGROUND', (0, first), (0, last), HexColor(label_bg)),
+            ('BACKGROUND', (0, first), (1, first), HexColor(header_bg)),
+            ('TEXTCOLOR', (0, first), (1, first), colors.white),
+            ('FONTNAME', (0, first), (1, first), 'Helvetica-Bold'),
+            ('FONTNAME', (0, first + 1), (0, last), 'Helvetica-Bold'),
+            ('FONTNAME', (1, first + 1), (1, last), 'Helvetica'),
+            ('GRID', (0, first), (-1, last), 1, colors.black),
+        ]
+        row_heights += [None] * rows
+        first = last + 1
+    return row_heights, TableStyle(commands)
+
+_DETAILS_ROW_HEIGHTS, _DETAILS_TS = _details_table_layout()
+_SPACER_ROW = ('', '')
+
+@functools.lru_cache(maxsize=1024)
+def _format_timestamp(timestamp_utc):
+    """Cached strptime/strftime, batches often share the same timestamp"""
+    try:
+        # Parse the timestamp format: "20250922T123311Z"
+        dt = datetime.strptime(timestamp_utc, "%Y%m%dT%H%M%SZ")
+        return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+    except (TypeError, ValueError):
+        return timestamp_utc
+
 class DataWipingCertificateGenerator:
     def __init__(self):
         self.setup_styles()
         
     def setup_styles(self):
-        """Setup custom styles for the certificate"""
-        self.styles = getSampleStyleSheet()
-        
-        # Custom title style
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            textColor=colors.darkblue,
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Custom subtitle style
-        self.subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            textColor=colors.grey,
-            alignment=TA_CENTER,
-            spaceAfter=15,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Custom section header style
-        self.section_header_style = ParagraphStyle(
-            'SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.darkblue,
-            spaceBefore=15,
-            spaceAfter=10,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Custom normal style
-        self.normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            textColor=colors.black,
-            spaceAfter=6,
-            fontName='Helvetica'
-        )
+        """Bind the shared certificate styles"""
+        self.styles = _STYLES
+        self.title_style = _TITLE_STYLE
+        self.subtitle_style = _SUBTITLE_STYLE
+        self.section_header_style = _SECTION_STYLE
+        self.normal_style = _NORMAL_STYLE
 
-    def create_qr_code(self, data, filename):
-        """Create QR code for certificate verification"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(filename)
-        return filename
+    def create_qr_code(self, data, size=1.5*inch):
+        """Create QR code for certificate verification as vector PDF drawing"""
+        qr = QrCodeWidget(data, barLevel='L', barBorder=4)
+        x1, y1, x2, y2 = qr.getBounds()
+        drawing = Drawing(size, size, transform=[size / (x2 - x1), 0, 0, size / (y2 - y1), 0, 0])
+        drawing.add(qr)
+        # Flowables default to left alignment, the old Image was centered
+        drawing.hAlign = 'CENTER'
+        return drawing
 
     def format_timestamp(self, timestamp_utc):
         """Format UTC timestamp to readable format"""
-        try:
-            # Parse the timestamp format: "20250922T123311Z"
-            dt = datetime.strptime(timestamp_utc, "%Y%m%dT%H%M%SZ")
-            return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-        except:
-            return timestamp_utc
+        return _format_timestamp(timestamp_utc)
 
-    def create_device_details_table(self, device_details):
-        """Create device details table"""
-        data = [
-            ['Device Information', ''],
-            ['Device Name', device_details.get('name', 'N/A')],
-            ['Device Path', device_details.get('path', 'N/A')],
-            ['Storage Size', device_details.get('size', 'N/A')],
-            ['Device Model', device_details.get('model', 'N/A')],
-            ['Serial Number', device_details.get('serial', 'N/A')],
-            ['Mount Point', device_details.get('mountpoint', 'None') or 'None'],
+    def device_details_rows(self, device_details):
+        """Rows for the device details section"""
+        get = device_details.get
+        return [
+            ('Device Information', ''),
+            ('Device Name', get('name', 'N/A')),
+            ('Device Path', get('path', 'N/A')),
+            ('Storage Size', get('size', 'N/A')),
+            ('Device Model', get('model', 'N/A')),
+            ('Serial Number', get('serial', 'N/A')),
+            ('Mount Point', get('mountpoint') or 'None'),
         ]
-        
-        table = Table(data, colWidths=[2.5*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), HexColor('#E8F4FD')),
-            ('BACKGROUND', (0, 0), (1, 0), HexColor('#4472C4')),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 1), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        return table
 
-    def create_wipe_details_table(self, wipe_data):
-        """Create wipe operation details table"""
-        data = [
-            ['Wipe Operation Details', ''],
-            ['Wipe Method', wipe_data.get('wipe_mode', 'N/A').title()],
-            ['Tool Version', wipe_data.get('tool_version', 'N/A')],
-            ['Timestamp (UTC)', self.format_timestamp(wipe_data.get('timestamp_utc', 'N/A'))],
-            ['Status', wipe_data.get('status', 'N/A')],
-            ['Operation Success', 'Yes' if wipe_data.get('success', False) else 'No'],
+    def wipe_details_rows(self, wipe_data):
+        """Rows for the wipe operation details section"""
+        get = wipe_data.get
+        return [
+            ('Wipe Operation Details', ''),
+            ('Wipe Method', get('wipe_mode', 'N/A').title()),
+            ('Tool Version', get('tool_version', 'N/A')),
+            ('Timestamp (UTC)', self.format_timestamp(get('timestamp_utc', 'N/A'))),
+            ('Status', get('status', 'N/A')),
+            ('Operation Success', 'Yes' if get('success', False) else 'No'),
         ]
-        
-        table = Table(data, colWidths=[2.5*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), HexColor('#E8F5E8')),
-            ('BACKGROUND', (0, 0), (1, 0), HexColor('#70AD47')),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 1), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        return table
 
-    def create_system_info_table(self, system_info):
-        """Create system information table"""
-        data = [
-            ['System & Environment', ''],
-            ['Hostname', system_info.get('hostname', 'N/A')],
-            ['Operating System', system_info.get('os', 'N/A')],
+    def system_info_rows(self, system_info):
+        """Rows for the system information section"""
+        get = system_info.get
+        return [
+            ('System & Environment', ''),
+            ('Hostname', get('hostname', 'N/A')),
+            ('Operating System', get('os', 'N/A')),
         ]
-        
-        table = Table(data, colWidths=[2.5*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), HexColor('#FDF2E9')),
-            ('BACKGROUND', (0, 0), (1, 0), HexColor('#E67E22')),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 1), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        return table
 
-    def create_verification_table(self, verification_data, certificate_id):
-        """Create verification and integrity table"""
+    def verification_rows(self, verification_data, certificate_id):
+        """Rows for the verification and integrity section"""
         log_hash = verification_data.get('log_hash_sha256', 'N/A')
         
+        return [
+            ('Verification & Integrity', ''),
+            ('Certificate ID', certificate_id),
+            ('Log File Hash (SHA-256)', log_hash[:32] + '...' if len(log_hash) > 32 else log_hash),
+            ('Certificate Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')),
+        ]
+
+    def create_details_table(self, wipe_data):
+        """Create device, wipe, system and verification sections as one table"""
         data = [
-            ['Verification & Integrity', ''],
-            ['Certificate ID', certificate_id],
-            ['Log File Hash (SHA-256)', log_hash[:32] + '...' if len(log_hash) > 32 else log_hash],
-            ['Certificate Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')],
+            *self.device_details_rows(wipe_data.get('device_details', {})),
+            _SPACER_ROW,
+            *self.wipe_details_rows(wipe_data),
+            _SPACER_ROW,
+            *self.system_info_rows(wipe_data.get('system_info', {})),
+            _SPACER_ROW,
+            *self.verification_rows(
+                wipe_data.get('verification', {}),
+                wipe_data.get('certificate_id', 'N/A')
+            ),
         ]
         
-        table = Table(data, colWidths=[2.5*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), HexColor('#FDE7F3')),
-            ('BACKGROUND', (0, 0), (1, 0), HexColor('#E91E63')),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 1), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        table = Table(data, colWidths=_COL_WIDTHS, rowHeights=_DETAILS_ROW_HEIGHTS)
+        table.setStyle(_DETAILS_TS)
         
         return table
 
@@ -224,86 +240,56 @@ class DataWipingCertificateGenerator:
             rightMargin=0.75*inch
         )
         
-        story = []
-        
-        # Header with logo placeholder and title
-        title = Paragraph("Certificate of Data Sanitization", self.title_style)
-        story.append(title)
-        
-        subtitle = Paragraph("Secure IT Asset Data Wiping Certification", self.subtitle_style)
-        story.append(subtitle)
-        story.append(Spacer(1, 20))
-        
-        # Certificate introduction
-        intro_text = """
-        This certificate verifies that secure data sanitization has been performed on the specified 
-        storage device in accordance with industry standards and best practices for IT asset recycling. 
-        The wiping process has been completed successfully and verified through cryptographic hashing.
-        """
-        intro_para = Paragraph(intro_text, self.normal_style)
-        story.append(intro_para)
-        story.append(Spacer(1, 15))
-        
-        # Device Details Section
-        story.append(self.create_device_details_table(wipe_data.get('device_details', {})))
-        story.append(Spacer(1, 15))
-        
-        # Wipe Details Section
-        story.append(self.create_wipe_details_table(wipe_data))
-        story.append(Spacer(1, 15))
-        
-        # System Information Section
-        story.append(self.create_system_info_table(wipe_data.get('system_info', {})))
-        story.append(Spacer(1, 15))
-        
-        # Verification Section
-        story.append(self.create_verification_table(
-            wipe_data.get('verification', {}), 
-            wipe_data.get('certificate_id', 'N/A')
-        ))
-        story.append(Spacer(1, 20))
+        story = [
+            # Header with logo placeholder and title
+            Paragraph("Certificate of Data Sanitization", self.title_style),
+            Paragraph("Secure IT Asset Data Wiping Certification", self.subtitle_style),
+            Spacer(1, 20),
+            
+            # Certificate introduction
+            Paragraph(_INTRO_TEXT, self.normal_style),
+            Spacer(1, 15),
+            
+            # Device, Wipe, System and Verification Sections
+            self.create_details_table(wipe_data),
+            Spacer(1, 20),
+        ]
         
         # Command Results Section (if available)
         if wipe_data.get('results'):
-            results_header = Paragraph("Command Execution Details", self.section_header_style)
-            story.append(results_header)
+            story.append(Paragraph("Command Execution Details", self.section_header_style))
             
             for i, result in enumerate(wipe_data['results'], 1):
-                cmd_text = f"<b>Command {i}:</b> {result.get('cmd', 'N/A')}<br/>"
-                cmd_text += f"<b>Return Code:</b> {result.get('returncode', 'N/A')}<br/>"
-                cmd_text += f"<b>Output:</b> {result.get('stdout', 'No output')[:100]}{'...' if len(result.get('stdout', '')) > 100 else ''}"
-                
-                cmd_para = Paragraph(cmd_text, self.normal_style)
-                story.append(cmd_para)
-                story.append(Spacer(1, 10))
+                stdout = result.get('stdout', 'No output')
+                cmd_text = _CMD_TEMPLATE.format(
+                    index=i,
+                    cmd=result.get('cmd', 'N/A'),
+                    returncode=result.get('returncode', 'N/A'),
+                    stdout=stdout[:100],
+                    ellipsis='...' if len(result.get('stdout', '')) > 100 else ''
+                )
+                story.extend((Paragraph(cmd_text, self.normal_style), Spacer(1, 10)))
         
         # QR Code for verification
         verification_url = f"https://your-verification-portal.com/verify/{wipe_data.get('certificate_id', '')}"
-        qr_filename = f"qr_{wipe_data.get('certificate_id', 'temp')}.png"
         
         try:
-            self.create_qr_code(verification_url, qr_filename)
-            
-            qr_header = Paragraph("Blockchain Verification", self.section_header_style)
-            story.append(qr_header)
-            
-            qr_text = Paragraph("Scan the QR code below to verify this certificate on the blockchain:", self.normal_style)
-            story.append(qr_text)
-            story.append(Spacer(1, 10))
+            qr_img = self.create_qr_code(verification_url)
             
-            # Add QR code image
-            qr_img = Image(qr_filename, width=1.5*inch, height=1.5*inch)
-            story.append(qr_img)
-            story.append(Spacer(1, 10))
-            
-            verify_text = Paragraph(f"<b>Verification URL:</b> {verification_url}", self.normal_style)
-            story.append(verify_text)
+            story.extend((
+                Paragraph("Blockchain Verification", self.section_header_style),
+                Paragraph("Scan the QR code below to verify this certificate on the blockchain:", self.normal_style),
+                Spacer(1, 10),
+                # QR code drawn as vectors, no image encoding
+                qr_img,
+                Spacer(1, 10),
+                Paragraph(f"<b>Verification URL:</b> {verification_url}", self.normal_style),
+            ))
             
         except Exception as e:
             print(f"QR code generation failed: {e}")
         
         # Footer
-        story.append(Spacer(1, 20))
         footer_text = f"""
         <para align="center">
         <b>This certificate is cryptographically secured and immutably stored on blockchain</b><br/>
@@ -312,19 +298,19 @@ class DataWipingCertificateGenerator:
         <i>Smart India Hackathon 2024 - Secure IT Asset Recycling Project</i>
         </para>
         """
-        footer_para = Paragraph(footer_text, self.normal_style)
-        story.append(footer_para)
+        story.extend((Spacer(1, 20), Paragraph(footer_text, self.normal_style)))
         
         # Build the PDF
         doc.build(story)
         
-        # Clean up QR code file
-        if os.path.exists(qr_filename):
-            os.remove(qr_filename)
-        
         print(f"Certificate generated successfully: {output_filename}")
         return output_filename
 
+@functools.lru_cache(maxsize=1)
+def get_generator():
+    """Shared generator instance, it holds no per-certificate state"""
+    return DataWipingCertificateGenerator()
+
 def main():
     """Test the certificate generator with mock data"""
     mock_data = {
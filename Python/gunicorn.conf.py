@@ -0,0 +1,22 @@
+import multiprocessing
+import os
+
+# Requests spend nearly all their time waiting on the Ethereum node and Pinata,
+# so each worker multiplexes many of them on greenlets.
+# Run with: gunicorn -c gunicorn.conf.py wsgi:application
+# Set GUNICORN_WORKER_CLASS=gthread if a dependency blocks under gevent.
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+worker_connections = 1000
+# Let dashboards polling /api/verify reuse their connection between requests;
+# gunicorn already sets TCP_NODELAY on its listening sockets
+keepalive = 30
+threads = 32 if worker_class == 'gthread' else 1
+
+# Keep the app import in each worker. Importing web_app already does the warm-up
+# work (Web3 connect + chain id, contract/ABI load, template render and
+# compression) before the worker accepts requests, and preloading would start
+# the logging QueueListener thread and open RPC sockets in the master, which
+# forked workers cannot safely share.
+preload_app = False
@@ -1,25 +1,78 @@
 import os
-import json
+import re
+import queue
+import atexit
 import logging
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
-from certificate_generator import DataWipingCertificateGenerator
+from certificate_generator import get_generator
 from blockchain_integration import BlockchainIntegration
 
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Verification error for an ID the contract does not know, as opposed to an
+# RPC failure; callers may cache the former but never the latter
+CERTIFICATE_NOT_FOUND = 'Certificate not found on blockchain'
+CERTIFICATE_LOOKUP_FAILED = 'Certificate lookup failed'
+
+# Certificate ids are free text (the UI embeds the device serial) but never
+# empty, longer than 128 characters or containing control characters
+CERTIFICATE_ID_RE = re.compile(r'[^\x00-\x1f\x7f]{1,128}')
+
+# Recently issued certificates, so a re-submitted report (double click,
+# re-upload) returns the original result without redoing the PDF/IPFS work
+ISSUED_CACHE_SIZE = 1024
+
+# Rough upper bound on issueCertificate gas, used to fail fast on low balance
+PRECHECK_GAS_LIMIT = 500000
+
+_REQUIRED_FIELDS = frozenset({
+    'certificate_id',
+    'device_details',
+    'timestamp_utc',
+    'success',
+    'status'
+})
+
+@functools.lru_cache(maxsize=1)
+def _queue_log_handler():
+    """Queue handler whose records are written to file/console by a background thread"""
+    log_queue = queue.Queue(-1)
+    
+    file_handler = logging.FileHandler('certificate_system.log', encoding='utf-8')
+    stream_handler = logging.StreamHandler()
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+    
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # Only the message is pre-rendered here, the listener's handlers add the prefix
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    return queue_handler
+
 class DataWipingCertificationSystem:
     def __init__(self):
+        self._issued = OrderedDict()
+        # certificate_id -> (data_hash, Future) for issuances still running
+        self._issuing = {}
+        self._issued_lock = threading.Lock()
         self.setup_logging()
-        self.generator = DataWipingCertificateGenerator()
+        self.generator = get_generator()
         self.blockchain = BlockchainIntegration()
         
     def setup_logging(self):
         """Setup logging configuration"""
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('certificate_system.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
+            handlers=[_queue_log_handler()]
         )
         self.logger = logging.getLogger(__name__)
 
@@ -41,89 +94,148 @@ class DataWipingCertificationSystem:
                 raise ValueError("Invalid wipe data provided")
             
             certificate_id = wipe_data.get('certificate_id')
-            self.logger.info(f"Processing certificate: {certificate_id}")
-            
-            # Step 1: Generate professional PDF certificate
-            self.logger.info("Generating PDF certificate...")
-            pdf_filename = self.generator.generate_certificate(wipe_data)
-            
-            # Step 2: Upload to IPFS
-            self.logger.info("Uploading certificate to IPFS...")
-            metadata = {
-                'name': f'Data Wiping Certificate - {certificate_id}',
-                'description': f'Secure data sanitization certificate for device {wipe_data.get("device_details", {}).get("serial", "unknown")}',
-                'certificateId': certificate_id,
-                'deviceSerial': wipe_data.get('device_details', {}).get('serial', ''),
-                'timestamp': wipe_data.get('timestamp_utc', ''),
-                'wipeMethod': wipe_data.get('wipe_mode', ''),
-                'toolVersion': wipe_data.get('tool_version', ''),
-                'attributes': [
-                    {'trait_type': 'Device Type', 'value': wipe_data.get('device_details', {}).get('model', 'Unknown')},
-                    {'trait_type': 'Storage Size', 'value': wipe_data.get('device_details', {}).get('size', 'Unknown')},
-                    {'trait_type': 'Wipe Method', 'value': wipe_data.get('wipe_mode', 'Unknown')},
-                    {'trait_type': 'Status', 'value': wipe_data.get('status', 'Unknown')}
-                ]
-            }
-            
-            ipfs_hash = self.blockchain.upload_to_ipfs(pdf_filename, metadata)
-            
-            if not ipfs_hash:
-                self.logger.warning("IPFS upload failed, proceeding without IPFS hash")
-                ipfs_hash = ""
-            
-            # Step 3: Issue certificate on blockchain
-            self.logger.info("⛓️ Issuing certificate on blockchain...")
-            receipt = self.blockchain.issue_certificate(wipe_data, ipfs_hash)
+            self.logger.info("Processing certificate: %s", certificate_id)
             
-            # Step 4: Clean up temporary files
-            if os.path.exists(pdf_filename):
-                os.remove(pdf_filename)
-                self.logger.info(f"Cleaned up temporary file: {pdf_filename}")
+            data_hash = self.blockchain.calculate_data_hash(wipe_data)
+            with self._issued_lock:
+                issued = self._issued.get(certificate_id) or self._issuing.get(certificate_id)
+                if issued is None:
+                    future = Future()
+                    self._issuing[certificate_id] = (data_hash, future)
             
-            # Step 5: Prepare result
-            result = {
-                'success': True,
-                'certificate_id': certificate_id,
-                'transaction_hash': receipt['transactionHash'].hex(),
-                'block_number': receipt['blockNumber'],
-                'gas_used': receipt['gasUsed'],
-                'ipfs_hash': ipfs_hash,
-                'ipfs_url': f'https://gateway.pinata.cloud/ipfs/{ipfs_hash}' if ipfs_hash else None,
-                'blockchain_explorer_url': f'https://etherscan.io/tx/{receipt["transactionHash"].hex()}',
-                'verification_url': f'https://your-portal.com/verify/{certificate_id}',
-                'issued_at': datetime.now().isoformat(),
-                'issuer_address': self.blockchain.account.address
-            }
+            if issued is not None:
+                issued_hash, issued_result = issued
+                if issued_hash != data_hash:
+                    raise ValueError(f"Certificate {certificate_id} was already issued with different data")
+                if isinstance(issued_result, Future):
+                    # A concurrent request is issuing it, share its outcome
+                    self.logger.info("Certificate %s is being issued, waiting", certificate_id)
+                    issued_result = issued_result.result()
+                self.logger.info("Certificate %s already issued in tx %s", certificate_id, issued_result['transaction_hash'])
+                return {**issued_result, 'already_issued': True}
             
-            self.logger.info("Certificate issuance completed successfully!")
-            self.logger.info(f"Certificate ID: {certificate_id}")
-            self.logger.info(f"Transaction Hash: {result['transaction_hash']}")
-            self.logger.info(f"IPFS Hash: {ipfs_hash}")
+            try:
+                result = self._issue_new_certificate(wipe_data, certificate_id)
+            except BaseException as e:
+                with self._issued_lock:
+                    del self._issuing[certificate_id]
+                future.set_exception(e)
+                raise
             
+            with self._issued_lock:
+                del self._issuing[certificate_id]
+                self._issued[certificate_id] = (data_hash, result)
+                if len(self._issued) > ISSUED_CACHE_SIZE:
+                    self._issued.popitem(last=False)
+            future.set_result(result)
             return result
             
         except Exception as e:
-            self.logger.error(f"Certificate processing failed: {e}")
+            self.logger.error("Certificate processing failed: %s", e)
             return {
                 'success': False,
                 'error': str(e),
                 'certificate_id': wipe_data.get('certificate_id', 'unknown')
             }
 
+    def _issue_new_certificate(self, wipe_data, certificate_id):
+        """Generate, upload and issue a certificate not issued before"""
+        # Fail fast on an unreachable node or empty account before the PDF/IPFS work
+        account_state = self.precheck_blockchain()
+        
+        # Step 1: Generate professional PDF certificate
+        self.logger.info("Generating PDF certificate...")
+        pdf_filename = self.generator.generate_certificate(wipe_data)
+        
+        # Step 2: Upload to IPFS
+        self.logger.info("Uploading certificate to IPFS...")
+        metadata = self.build_ipfs_metadata(wipe_data)
+        
+        ipfs_hash = self.blockchain.upload_to_ipfs(pdf_filename, metadata)
+        
+        if not ipfs_hash:
+            self.logger.warning("IPFS upload failed, proceeding without IPFS hash")
+            ipfs_hash = ""
+        
+        # Step 3: Issue certificate on blockchain
+        self.logger.info("⛓️ Issuing certificate on blockchain...")
+        receipt = self.blockchain.issue_certificate(
+            wipe_data, ipfs_hash, account_state
+        )
+        
+        # Step 4: Clean up temporary files
+        if os.path.exists(pdf_filename):
+            os.remove(pdf_filename)
+            self.logger.info("Cleaned up temporary file: %s", pdf_filename)
+        
+        # Step 5: Prepare result
+        # HexBytes.hex() has no 0x prefix since hexbytes 1.0
+        tx_hash = receipt['transactionHash'].to_0x_hex()
+        result = {
+            'success': True,
+            'certificate_id': certificate_id,
+            'transaction_hash': tx_hash,
+            'block_number': receipt['blockNumber'],
+            'gas_used': receipt['gasUsed'],
+            'ipfs_hash': ipfs_hash,
+            'ipfs_url': f'https://gateway.pinata.cloud/ipfs/{ipfs_hash}' if ipfs_hash else None,
+            'blockchain_explorer_url': f'https://etherscan.io/tx/{tx_hash}',
+            'verification_url': f'https://your-portal.com/verify/{certificate_id}',
+            'issued_at': datetime.now().isoformat(),
+            'issuer_address': self.blockchain.account.address
+        }
+        
+        self.logger.info("Certificate issuance completed successfully!")
+        self.logger.info("Certificate ID: %s", certificate_id)
+        self.logger.info("Transaction Hash: %s", result['transaction_hash'])
+        self.logger.info("IPFS Hash: %s", ipfs_hash)
+        
+        return result
+
+    def precheck_blockchain(self):
+        """Fetch gas price and balance and check the account can pay for issuance"""
+        gas_price, balance = self.blockchain.fetch_account_state()
+        
+        required = gas_price * PRECHECK_GAS_LIMIT
+        if balance < required:
+            raise ValueError(
+                f"Insufficient balance for issuance. Need ~{self.blockchain.web3.from_wei(required, 'ether')} ETH, "
+                f"have {self.blockchain.web3.from_wei(balance, 'ether')} ETH"
+            )
+        
+        return gas_price, balance
+
+    def build_ipfs_metadata(self, wipe_data):
+        """Build the Pinata metadata for a certificate PDF"""
+        certificate_id = wipe_data.get('certificate_id')
+        device_details = wipe_data.get('device_details', {})
+        
+        return {
+            'name': f'Data Wiping Certificate - {certificate_id}',
+            'description': f'Secure data sanitization certificate for device {device_details.get("serial", "unknown")}',
+            'certificateId': certificate_id,
+            'deviceSerial': device_details.get('serial', ''),
+            'timestamp': wipe_data.get('timestamp_utc', ''),
+            'wipeMethod': wipe_data.get('wipe_mode', ''),
+            'toolVersion': wipe_data.get('tool_version', ''),
+            'attributes': [
+                {'trait_type': 'Device Type', 'value': device_details.get('model', 'Unknown')},
+                {'trait_type': 'Storage Size', 'value': device_details.get('size', 'Unknown')},
+                {'trait_type': 'Wipe Method', 'value': wipe_data.get('wipe_mode', 'Unknown')},
+                {'trait_type': 'Status', 'value': wipe_data.get('status', 'Unknown')}
+            ]
+        }
+
     def validate_wipe_data(self, wipe_data):
         """Validate the wipe data structure"""
-        required_fields = [
-            'certificate_id',
-            'device_details',
-            'timestamp_utc',
-            'success',
-            'status'
-        ]
+        missing = _REQUIRED_FIELDS - wipe_data.keys()
+        if missing:
+            self.logger.error("Missing required fields: %s", ', '.join(sorted(missing)))
+            return False
         
-        for field in required_fields:
-            if field not in wipe_data:
-                self.logger.error(f"Missing required field: {field}")
-                return False
+        if not isinstance(wipe_data['certificate_id'], str) or not CERTIFICATE_ID_RE.fullmatch(wipe_data['certificate_id']):
+            self.logger.error("Malformed certificate id")
+            return False
         
         # Validate device details
         device_details = wipe_data.get('device_details', {})
@@ -141,29 +253,19 @@ class DataWipingCertificationSystem:
     def verify_certificate(self, certificate_id):
         """Verify a certificate on the blockchain"""
         try:
-            self.logger.info(f"Verifying certificate: {certificate_id}")
+            self.logger.info("Verifying certificate: %s", certificate_id)
             
             verification_result = self.blockchain.verify_certificate(certificate_id)
+            response = self._verification_response(certificate_id, verification_result)
             
-            if verification_result and verification_result['exists']:
+            if response['valid']:
                 self.logger.info("Certificate verified successfully")
-                return {
-                    'valid': True,
-                    'certificate_id': certificate_id,
-                    'verification_result': verification_result,
-                    'verified_at': datetime.now().isoformat()
-                }
             else:
                 self.logger.warning("Certificate not found or invalid")
-                return {
-                    'valid': False,
-                    'certificate_id': certificate_id,
-                    'error': 'Certificate not found on blockchain',
-                    'verified_at': datetime.now().isoformat()
-                }
+            return response
                 
         except Exception as e:
-            self.logger.error(f"Certificate verification failed: {e}")
+            self.logger.error("Certificate verification failed: %s", e)
             return {
                 'valid': False,
                 'certificate_id': certificate_id,
@@ -171,35 +273,88 @@ class DataWipingCertificationSystem:
                 'verified_at': datetime.now().isoformat()
             }
 
+    def verify_certificates_batch(self, certificate_ids):
+        """Verify several certificates with batched blockchain lookups"""
+        self.logger.info("Verifying %d certificates", len(certificate_ids))
+        try:
+            verification_results = self.blockchain.verify_certificates_batch(certificate_ids)
+        except Exception as e:
+            self.logger.error("Batch certificate verification failed: %s", e)
+            verified_at = datetime.now().isoformat()
+            return [
+                {'valid': False, 'certificate_id': cid, 'error': str(e), 'verified_at': verified_at}
+                for cid in certificate_ids
+            ]
+        
+        return [
+            self._verification_response(cid, result)
+            for cid, result in zip(certificate_ids, verification_results)
+        ]
+    
+    def _verification_response(self, certificate_id, verification_result):
+        """Build the API result for one verifyCertificate lookup"""
+        if verification_result and verification_result['exists']:
+            return {
+                'valid': True,
+                'certificate_id': certificate_id,
+                'verification_result': verification_result,
+                'verified_at': datetime.now().isoformat()
+            }
+        return {
+            'valid': False,
+            'certificate_id': certificate_id,
+            'error': CERTIFICATE_LOOKUP_FAILED if verification_result is None else CERTIFICATE_NOT_FOUND,
+            'verified_at': datetime.now().isoformat()
+        }
+
     def get_certificate_details(self, certificate_id):
         """Get detailed certificate information from blockchain"""
         try:
             details = self.blockchain.get_certificate_details(certificate_id)
-            
-            if details:
-                # Enhance with IPFS URL
-                if details['ipfs_hash']:
-                    details['ipfs_url'] = f'https://gateway.pinata.cloud/ipfs/{details["ipfs_hash"]}'
-                
-                return {
-                    'success': True,
-                    'certificate_details': details,
-                    'retrieved_at': datetime.now().isoformat()
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': 'Certificate not found',
-                    'certificate_id': certificate_id
-                }
+            return self._details_response(certificate_id, details)
                 
         except Exception as e:
-            self.logger.error(f"Failed to get certificate details: {e}")
+            self.logger.error("Failed to get certificate details: %s", e)
             return {
                 'success': False,
                 'error': str(e),
                 'certificate_id': certificate_id
             }
+    
+    def get_certificate_details_batch(self, certificate_ids):
+        """Get details for several certificates with one blockchain call"""
+        try:
+            details_list = self.blockchain.get_certificate_details_batch(certificate_ids)
+        except Exception as e:
+            self.logger.error("Failed to get certificate details: %s", e)
+            return [
+                {'success': False, 'error': str(e), 'certificate_id': cid}
+                for cid in certificate_ids
+            ]
+        
+        return [
+            self._details_response(cid, details)
+            for cid, details in zip(certificate_ids, details_list)
+        ]
+    
+    def _details_response(self, certificate_id, details):
+        """Build the API result for one getCertificateDetails lookup"""
+        if not details:
+            return {
+                'success': False,
+                'error': CERTIFICATE_NOT_FOUND,
+                'certificate_id': certificate_id
+            }
+        
+        # Enhance with IPFS URL
+        if details['ipfs_hash']:
+            details['ipfs_url'] = f'https://gateway.pinata.cloud/ipfs/{details["ipfs_hash"]}'
+        
+        return {
+            'success': True,
+            'certificate_details': details,
+            'retrieved_at': datetime.now().isoformat()
+        }
 
 def main():
     """Test the system with your mock data"""
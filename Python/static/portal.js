@@ -0,0 +1,95 @@
+document.getElementById('verifyForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const certificateId = document.getElementById('certificateId').value;
+    const resultDiv = document.getElementById('result');
+    const loadingDiv = document.getElementById('loading');
+
+    // Show loading
+    loadingDiv.style.display = 'block';
+    resultDiv.innerHTML = '';
+
+    try {
+        const response = await fetch(`/api/verify/${encodeURIComponent(certificateId)}`);
+        const result = await response.json();
+
+        loadingDiv.style.display = 'none';
+
+        if (result.valid) {
+            resultDiv.innerHTML = `
+                <div class="result success">
+                    <h3>✅ Certificate Verified Successfully!</h3>
+                    <div class="certificate-details">
+                        <div class="detail-card">
+                            <h3>Basic Information</h3>
+                            <div class="detail-item">
+                                <span class="detail-label">Certificate ID:</span>
+                                <span class="detail-value">${certificateId}</span>
+                            </div>
+                            <div class="detail-item">
+                                <span class="detail-label">Device Serial:</span>
+                                <span class="detail-value">${result.verification_result.device_serial}</span>
+                            </div>
+                            <div class="detail-item">
+                                <span class="detail-label">Wipe Method:</span>
+                                <span class="detail-value">${result.verification_result.wipe_method}</span>
+                            </div>
+                            <div class="detail-item">
+                                <span class="detail-label">Timestamp:</span>
+                                <span class="detail-value">${result.verification_result.timestamp}</span>
+                            </div>
+                        </div>
+                        <div class="detail-card">
+                            <h3>Blockchain Information</h3>
+                            <div class="detail-item">
+                                <span class="detail-label">Issuer Address:</span>
+                                <span class="detail-value">${result.verification_result.issuer}</span>
+                            </div>
+                            <div class="detail-item">
+                                <span class="detail-label">Block Timestamp:</span>
+                                <span class="detail-value">${new Date(result.verification_result.created_at * 1000).toLocaleString()}</span>
+                            </div>
+                            <div class="detail-item">
+                                <span class="detail-label">Status:</span>
+                                <span class="detail-value">${result.verification_result.is_valid ? 'Active' : 'Revoked'}</span>
+                            </div>
+                        </div>
+                    </div>
+                    ${result.verification_result.ipfs_hash ? `
+                        <div class="links">
+                            <a href="https://gateway.pinata.cloud/ipfs/${result.verification_result.ipfs_hash}" 
+                               target="_blank" class="link-btn">📄 View Certificate PDF</a>
+                            <a href="/api/details/${certificateId}" target="_blank" class="link-btn">🔍 Full Details</a>
+                        </div>
+                    ` : ''}
+                </div>
+            `;
+        } else {
+            resultDiv.innerHTML = `
+                <div class="result error">
+                    <h3>❌ Certificate Not Found</h3>
+                    <p><strong>Certificate ID:</strong> ${certificateId}</p>
+                    <p><strong>Error:</strong> ${result.error || 'This certificate does not exist on the blockchain or is invalid.'}</p>
+                    <p><strong>Verified At:</strong> ${result.verified_at}</p>
+                    <p>Please check the certificate ID and try again. Make sure you've entered the complete certificate ID exactly as provided.</p>
+                </div>
+            `;
+        }
+    } catch (error) {
+        loadingDiv.style.display = 'none';
+        resultDiv.innerHTML = `
+            <div class="result error">
+                <h3>❌ Verification Error</h3>
+                <p><strong>Error:</strong> ${error.message}</p>
+                <p>Please try again. If the problem persists, contact support.</p>
+            </div>
+        `;
+    }
+});
+
+// Auto-fill if certificate ID is in URL
+const urlParams = new URLSearchParams(window.location.search);
+const certId = urlParams.get('cert');
+if (certId) {
+    document.getElementById('certificateId').value = certId;
+}
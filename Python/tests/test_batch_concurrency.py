@@ -0,0 +1,138 @@
+"""JSON-RPC batches must not capture calls made concurrently on the shared Web3"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('dotenv')
+pytest.importorskip('eth_tester')
+web3 = pytest.importorskip('web3')
+
+from web3.providers.eth_tester import EthereumTesterProvider
+
+import blockchain_integration
+
+BUILD_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'build', 'contracts', 'DataWipingCertificate.json'
+)
+
+CERTIFICATE_IDS = ['CERT-%03d' % i for i in range(8)]
+
+# Per-request delay of the fake node, widens the window in which a batch is open
+RPC_LATENCY = 0.005
+
+
+def _serve_tester(provider, sender):
+    """Expose an eth-tester provider as an HTTP JSON-RPC node, batches included"""
+    lock = threading.Lock()
+
+    def handle(call):
+        params = call.get('params', [])
+        if call['method'] in ('eth_call', 'eth_estimateGas'):
+            # eth-tester requires a sender; web3's tester middleware normally adds it
+            params[0].setdefault('from', sender)
+        with lock:
+            response = provider.make_request(call['method'], params)
+        return {**response, 'id': call.get('id')}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            time.sleep(RPC_LATENCY)
+            if isinstance(payload, list):
+                body = [handle(call) for call in payload]
+            else:
+                body = handle(payload)
+            data = web3.Web3.to_json(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def blockchain(monkeypatch):
+    """BlockchainIntegration talking to a local eth-tester chain over HTTP"""
+    with open(BUILD_PATH) as f:
+        build = json.load(f)
+
+    provider = EthereumTesterProvider()
+    tester = web3.Web3(provider)
+    owner = tester.eth.accounts[0]
+    factory = tester.eth.contract(abi=build['abi'], bytecode=build['bytecode'])
+    receipt = tester.eth.wait_for_transaction_receipt(factory.constructor().transact({'from': owner}))
+    contract = tester.eth.contract(address=receipt.contractAddress, abi=build['abi'])
+    for i, cid in enumerate(CERTIFICATE_IDS):
+        contract.functions.issueCertificate(
+            cid, '/dev/sda', 'model', 'SN-%d' % i, 'purge', 'ts', 'host', '1.0', 'log', 'ipfs'
+        ).transact({'from': owner})
+
+    server = _serve_tester(provider, owner)
+    key = provider.ethereum_tester.backend.account_keys[0]
+    monkeypatch.setenv('RPC_URL', 'http://127.0.0.1:%d' % server.server_address[1])
+    monkeypatch.setenv('PRIVATE_KEY', key.to_hex())
+    monkeypatch.setenv('CONTRACT_ADDRESS', contract.address)
+    try:
+        yield blockchain_integration.BlockchainIntegration()
+    finally:
+        server.shutdown()
+        blockchain_integration._connect_web3.cache_clear()
+        blockchain_integration._load_contract.cache_clear()
+        blockchain_integration._rpc_session.cache_clear()
+
+
+def test_shared_web3_refuses_batches(blockchain):
+    with pytest.raises(RuntimeError):
+        blockchain.web3.batch_requests()
+
+
+def test_batch_does_not_capture_concurrent_calls(blockchain):
+    expected = {cid: 'SN-%d' % i for i, cid in enumerate(CERTIFICATE_IDS)}
+
+    def single(i):
+        cid = CERTIFICATE_IDS[i % len(CERTIFICATE_IDS)]
+        return [(cid, blockchain.verify_certificate(cid))]
+
+    def batch(_):
+        return list(zip(CERTIFICATE_IDS, blockchain.verify_certificates_batch(CERTIFICATE_IDS)))
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(batch if i % 4 == 0 else single, i) for i in range(200)]
+        results = [pair for future in futures for pair in future.result()]
+
+    failures = [cid for cid, result in results
+                if result is None or not result['exists'] or result['device_serial'] != expected[cid]]
+    assert not failures
+
+def test_account_state_batch_does_not_capture_concurrent_calls(blockchain):
+    balance = blockchain.web3.eth.get_balance(blockchain.account.address)
+
+    def account_state(_):
+        blockchain._gas_price_cache = (0.0, 0)
+        return blockchain.fetch_account_state()[1]
+
+    def single(_):
+        return blockchain.verify_certificate(CERTIFICATE_IDS[0])['device_serial']
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(account_state if i % 4 == 0 else single, i) for i in range(200)]
+        results = [future.result() for future in futures]
+
+    assert set(results) == {balance, 'SN-0'}
@@ -1,392 +1,526 @@
-from flask import Flask, render_template_string, request, jsonify, redirect, url_for
-from main_certificate_system import DataWipingCertificationSystem
+from flask import Flask, Response, request, jsonify, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.serving import WSGIRequestHandler
+from main_certificate_system import DataWipingCertificationSystem, CERTIFICATE_NOT_FOUND, CERTIFICATE_ID_RE
 import json
+import gzip
+import hashlib
+import hmac
+import os
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 
-app = Flask(__name__)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to Flask's stdlib json
+    orjson = None
+
+try:
+    import redis
+except ImportError:  # the shared cache is optional, the local LRU still works
+    redis = None
+
+try:
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+except ImportError:  # rate limiting is skipped without flask-limiter
+    Limiter = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return self._dumps_bytes(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
+    
+    def _dumps_bytes(self, obj):
+        try:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. uint256 values beyond orjson's 64-bit integer range
+            return super().dumps(obj).encode('utf-8')
+
+
+app = Flask(__name__, static_folder='static', template_folder='templates')
+# Static assets carry a content-hash query string, so they can be cached for a year
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+# Unhandled errors become plain 500s; the API handlers report their own
+app.config['PROPAGATE_EXCEPTIONS'] = False
+# Reject oversized request bodies before they are read or parsed
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 256 * 1024))
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+# Number of reverse proxies in front of the app; rate limits key on the
+# client address, which without this is the proxy's for every request
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+if TRUSTED_PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT, x_proto=TRUSTED_PROXY_COUNT)
 cert_system = DataWipingCertificationSystem()
 
-# HTML Template for verification portal
-VERIFICATION_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Data Wiping Certificate Verification Portal</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        .container { 
-            max-width: 1200px; 
-            margin: auto; 
-            background: white; 
-            padding: 40px; 
-            border-radius: 15px; 
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-        }
-        .header {
-            text-align: center;
-            margin-bottom: 40px;
-            padding-bottom: 20px;
-            border-bottom: 3px solid #667eea;
-        }
-        .header h1 { 
-            color: #333; 
-            margin-bottom: 10px;
-            font-size: 2.5em;
-        }
-        .header p { 
-            color: #666; 
-            font-size: 1.1em;
-        }
-        .verification-section {
-            background: #f8f9ff;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }
-        .form-group { 
-            margin-bottom: 20px; 
-        }
-        label { 
-            display: block; 
-            margin-bottom: 8px; 
-            font-weight: bold; 
-            color: #333;
-        }
-        input[type="text"] { 
-            width: 100%; 
-            padding: 12px; 
-            border: 2px solid #ddd; 
-            border-radius: 8px; 
-            font-size: 16px;
-            transition: border-color 0.3s;
-        }
-        input[type="text"]:focus {
-            outline: none;
-            border-color: #667eea;
-        }
-        .btn { 
-            background: linear-gradient(45deg, #667eea, #764ba2); 
-            color: white; 
-            padding: 12px 30px; 
-            border: none; 
-            border-radius: 8px; 
-            cursor: pointer; 
-            font-size: 16px;
-            font-weight: bold;
-            transition: transform 0.2s;
-        }
-        .btn:hover { 
-            transform: translateY(-2px);
-        }
-        .result { 
-            margin-top: 30px; 
-            padding: 20px; 
-            border-radius: 8px;
-        }
-        .success { 
-            background: #d4edda; 
-            color: #155724; 
-            border: 1px solid #c3e6cb;
-        }
-        .error { 
-            background: #f8d7da; 
-            color: #721c24; 
-            border: 1px solid #f5c6cb;
-        }
-        .certificate-details {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-            margin-top: 20px;
-        }
-        .detail-card {
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            border-left: 4px solid #667eea;
-        }
-        .detail-card h3 {
-            color: #333;
-            margin-bottom: 10px;
-        }
-        .detail-item {
-            display: flex;
-            justify-content: space-between;
-            margin-bottom: 8px;
-            padding: 5px 0;
-            border-bottom: 1px solid #eee;
-        }
-        .detail-label {
-            font-weight: bold;
-            color: #555;
-        }
-        .detail-value {
-            color: #333;
-            word-break: break-all;
-        }
-        .links {
-            margin-top: 20px;
-            display: flex;
-            gap: 15px;
-            flex-wrap: wrap;
-        }
-        .link-btn {
-            padding: 8px 16px;
-            background: #28a745;
-            color: white;
-            text-decoration: none;
-            border-radius: 5px;
-            font-size: 14px;
-        }
-        .link-btn:hover {
-            background: #218838;
-        }
-        .smart-india-badge {
-            background: linear-gradient(45deg, #ff6b6b, #ffd93d);
-            color: white;
-            padding: 10px 20px;
-            border-radius: 25px;
-            text-align: center;
-            font-weight: bold;
-            margin: 20px 0;
-        }
-        .loading {
-            display: none;
-            text-align: center;
-            color: #667eea;
-        }
-        .spinner {
-            border: 3px solid #f3f3f3;
-            border-top: 3px solid #667eea;
-            border-radius: 50%;
-            width: 30px;
-            height: 30px;
-            animation: spin 1s linear infinite;
-            margin: 10px auto;
-        }
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🔒 Certificate Verification Portal</h1>
-            <p>Secure IT Asset Data Wiping Certification System</p>
-            <div class="smart-india-badge">
-                🏆 Smart India Hackathon 2024 Project
-            </div>
-        </div>
-        
-        <div class="verification-section">
-            <h2>Verify Certificate</h2>
-            <form id="verifyForm">
-                <div class="form-group">
-                    <label for="certificateId">Certificate ID:</label>
-                    <input type="text" id="certificateId" name="certificateId" 
-                           placeholder="Enter certificate ID (e.g., certificate__dev_sdd_20250922T123311Z)" required>
-                </div>
-                <button type="submit" class="btn">Verify Certificate</button>
-            </form>
-            
-            <div class="loading" id="loading">
-                <div class="spinner"></div>
-                <p>Verifying certificate on blockchain...</p>
-            </div>
-            
-            <div id="result"></div>
-        </div>
-        
-        <div class="verification-section">
-            <h2>About This System</h2>
-            <p>This verification portal validates data sanitization certificates stored on the Ethereum blockchain. 
-            Each certificate represents a completed secure data wiping operation and contains cryptographic proof 
-            of the sanitization process.</p>
-            <ul style="margin-top: 15px; padding-left: 20px;">
-                <li>Certificates are immutably stored on blockchain</li>
-                <li>PDF certificates are stored on IPFS for permanent access</li>
-                <li>Cryptographic hashing ensures data integrity</li>
-                <li>Smart contracts provide transparent verification</li>
-            </ul>
-        </div>
-    </div>
-
-    <script>
-        document.getElementById('verifyForm').addEventListener('submit', async function(e) {
-            e.preventDefault();
-            
-            const certificateId = document.getElementById('certificateId').value;
-            const resultDiv = document.getElementById('result');
-            const loadingDiv = document.getElementById('loading');
-            
-            // Show loading
-            loadingDiv.style.display = 'block';
-            resultDiv.innerHTML = '';
-            
-            try {
-                const response = await fetch(`/api/verify/${encodeURIComponent(certificateId)}`);
-                const result = await response.json();
-                
-                loadingDiv.style.display = 'none';
-                
-                if (result.valid) {
-                    resultDiv.innerHTML = `
-                        <div class="result success">
-                            <h3>✅ Certificate Verified Successfully!</h3>
-                            <div class="certificate-details">
-                                <div class="detail-card">
-                                    <h3>Basic Information</h3>
-                                    <div class="detail-item">
-                                        <span class="detail-label">Certificate ID:</span>
-                                        <span class="detail-value">${certificateId}</span>
-                                    </div>
-                                    <div class="detail-item">
-                                        <span class="detail-label">Device Serial:</span>
-                                        <span class="detail-value">${result.verification_result.device_serial}</span>
-                                    </div>
-                                    <div class="detail-item">
-                                        <span class="detail-label">Wipe Method:</span>
-                                        <span class="detail-value">${result.verification_result.wipe_method}</span>
-                                    </div>
-                                    <div class="detail-item">
-                                        <span class="detail-label">Timestamp:</span>
-                                        <span class="detail-value">${result.verification_result.timestamp}</span>
-                                    </div>
-                                </div>
-                                <div class="detail-card">
-                                    <h3>Blockchain Information</h3>
-                                    <div class="detail-item">
-                                        <span class="detail-label">Issuer Address:</span>
-                                        <span class="detail-value">${result.verification_result.issuer}</span>
-                                    </div>
-                                    <div class="detail-item">
-                                        <span class="detail-label">Block Timestamp:</span>
-                                        <span class="detail-value">${new Date(result.verification_result.created_at * 1000).toLocaleString()}</span>
-                                    </div>
-                                    <div class="detail-item">
-                                        <span class="detail-label">Status:</span>
-                                        <span class="detail-value">${result.verification_result.is_valid ? 'Active' : 'Revoked'}</span>
-                                    </div>
-                                </div>
-                            </div>
-                            ${result.verification_result.ipfs_hash ? `
-                                <div class="links">
-                                    <a href="https://gateway.pinata.cloud/ipfs/${result.verification_result.ipfs_hash}" 
-                                       target="_blank" class="link-btn">📄 View Certificate PDF</a>
-                                    <a href="/api/details/${certificateId}" target="_blank" class="link-btn">🔍 Full Details</a>
-                                </div>
-                            ` : ''}
-                        </div>
-                    `;
-                } else {
-                    resultDiv.innerHTML = `
-                        <div class="result error">
-                            <h3>❌ Certificate Not Found</h3>
-                            <p><strong>Certificate ID:</strong> ${certificateId}</p>
-                            <p><strong>Error:</strong> ${result.error || 'This certificate does not exist on the blockchain or is invalid.'}</p>
-                            <p><strong>Verified At:</strong> ${result.verified_at}</p>
-                            <p>Please check the certificate ID and try again. Make sure you've entered the complete certificate ID exactly as provided.</p>
-                        </div>
-                    `;
-                }
-            } catch (error) {
-                loadingDiv.style.display = 'none';
-                resultDiv.innerHTML = `
-                    <div class="result error">
-                        <h3>❌ Verification Error</h3>
-                        <p><strong>Error:</strong> ${error.message}</p>
-                        <p>Please try again. If the problem persists, contact support.</p>
-                    </div>
-                `;
-            }
-        });
-        
-        // Auto-fill if certificate ID is in URL
-        const urlParams = new URLSearchParams(window.location.search);
-        const certId = urlParams.get('cert');
-        if (certId) {
-            document.getElementById('certificateId').value = certId;
-        }
-    </script>
-</body>
-</html>
-"""
+# Positive lookups only; a mined certificate does not change, so repeat
+# requests for the same ID can skip the RPC round trip until the TTL expires
+LOOKUP_CACHE_SIZE = 4096
+LOOKUP_CACHE_TTL = 300
+MAX_BATCH_VERIFY = 100
+_lookup_caches = {'verify': OrderedDict(), 'details': OrderedDict()}
+_cache_lock = threading.Lock()
+
+# Optional Redis layer shared by all workers, so each certificate costs one
+# RPC per deployment instead of one per worker. Keys include a hash of the
+# RPC URL and contract address so a redeploy never serves stale entries.
+REDIS_URL = os.getenv('REDIS_URL')
+SHARED_CACHE_TTL = 3600
+_SHARED_CACHE_NAMESPACE = hashlib.sha1(
+    f"{os.getenv('RPC_URL', '')}|{os.getenv('CONTRACT_ADDRESS', '')}".encode('utf-8')
+).hexdigest()[:12]
+
+@functools.lru_cache(maxsize=None)
+def _redis_client():
+    """Return the shared cache client, or None when Redis is not configured"""
+    if redis is None or not REDIS_URL:
+        return None
+    from redis.backoff import NoBackoff
+    from redis.retry import Retry
+    
+    # Fail fast: an unreachable cache must not add latency to lookups
+    return redis.Redis.from_url(
+        REDIS_URL,
+        socket_timeout=0.2,
+        socket_connect_timeout=0.2,
+        retry=Retry(NoBackoff(), 0)
+    )
+
+def _shared_cache_key(kind, certificate_id):
+    return f"{kind}:{_SHARED_CACHE_NAMESPACE}:{certificate_id}"
+
+def _shared_cache_get(kind, certificate_id):
+    client = _redis_client()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_shared_cache_key(kind, certificate_id))
+    except redis.RedisError as e:
+        app.logger.warning("Shared cache read failed: %s", e)
+        return None
+    if raw is None:
+        return None
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _shared_cache_put(kind, certificate_id, result):
+    client = _redis_client()
+    if client is None:
+        return
+    try:
+        payload = orjson.dumps(result) if orjson is not None else json.dumps(result)
+        client.setex(_shared_cache_key(kind, certificate_id), SHARED_CACHE_TTL, payload)
+    except (TypeError, redis.RedisError) as e:
+        app.logger.warning("Shared cache write failed: %s", e)
+
+def _cache_get(kind, certificate_id):
+    """Return a fresh cached result, or None on miss/expiry"""
+    cache = _lookup_caches[kind]
+    with _cache_lock:
+        entry = cache.get(certificate_id)
+        if entry is not None:
+            stored_at, result = entry
+            if time.monotonic() - stored_at < LOOKUP_CACHE_TTL:
+                cache.move_to_end(certificate_id)
+                return result
+            del cache[certificate_id]
+    
+    result = _shared_cache_get(kind, certificate_id)
+    if result is not None:
+        _local_cache_put(cache, certificate_id, result)
+    return result
+
+def _local_cache_put(cache, certificate_id, result):
+    """Store a result, evicting the least recently used entry when full"""
+    with _cache_lock:
+        cache[certificate_id] = (time.monotonic(), result)
+        cache.move_to_end(certificate_id)
+        if len(cache) > LOOKUP_CACHE_SIZE:
+            cache.popitem(last=False)
+
+def _cache_put(kind, certificate_id, result):
+    """Store a result locally and in the shared cache"""
+    _local_cache_put(_lookup_caches[kind], certificate_id, result)
+    _shared_cache_put(kind, certificate_id, result)
+
+# IDs the contract reported as unknown are answered locally for a short
+# while, so a loop over random IDs does not turn into one RPC per request
+NEGATIVE_CACHE_SIZE = 200000
+NEGATIVE_CACHE_TTL = 60
+_missing_ids = OrderedDict()
+
+def _cached_missing(kind, certificate_id):
+    """Return the remembered not-found result for an ID, or None"""
+    key = (kind, certificate_id)
+    with _cache_lock:
+        entry = _missing_ids.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= NEGATIVE_CACHE_TTL:
+            del _missing_ids[key]
+            return None
+        return result
+
+def _remember_lookup(kind, certificate_id, result):
+    """Cache a lookup result: positives for long, not-found briefly"""
+    if result.get('valid') or result.get('success'):
+        _cache_put(kind, certificate_id, result)
+    elif result.get('error') == CERTIFICATE_NOT_FOUND:
+        key = (kind, certificate_id)
+        with _cache_lock:
+            _missing_ids[key] = (time.monotonic(), result)
+            _missing_ids.move_to_end(key)
+            if len(_missing_ids) > NEGATIVE_CACHE_SIZE:
+                _missing_ids.popitem(last=False)
+
+def _forget_missing(certificate_id):
+    """Drop not-found entries for an ID, e.g. once it has been issued"""
+    with _cache_lock:
+        for kind in _lookup_caches:
+            _missing_ids.pop((kind, certificate_id), None)
+
+# Concurrent requests for the same uncached ID share one upstream call
+INFLIGHT_TIMEOUT = 30
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _coalesced(key, fetch):
+    """Run fetch() once for all concurrent callers asking for the same key"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    
+    if not owner:
+        return future.result(timeout=INFLIGHT_TIMEOUT)
+    
+    try:
+        result = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+def _verify_and_remember(certificate_id):
+    result = cert_system.verify_certificate(certificate_id)
+    _remember_lookup('verify', certificate_id, result)
+    return result
+
+def _details_and_remember(certificate_id):
+    result = cert_system.get_certificate_details(certificate_id)
+    _remember_lookup('details', certificate_id, result)
+    return result
+
+# Per-client limits on everything that can reach the node; batch requests
+# are charged one unit per certificate id
+VERIFY_RATE_LIMIT = os.getenv('VERIFY_RATE_LIMIT', '30/minute;5/second')
+BATCH_RATE_LIMIT = os.getenv('BATCH_RATE_LIMIT', '300/minute;100/second')
+if Limiter is not None:
+    # Limits live in Redis when configured; if it goes away, fall back to
+    # per-worker memory instead of failing the request
+    limiter = Limiter(
+        get_remote_address,
+        app=app,
+        storage_uri=REDIS_URL or 'memory://',
+        in_memory_fallback_enabled=True,
+        swallow_errors=True
+    )
+else:
+    limiter = None
+
+def _rate_limit(limit, cost=1):
+    """Per-client rate limit, a no-op when flask-limiter is not installed"""
+    if limiter is None:
+        return lambda view: view
+    return limiter.limit(limit, cost=cost)
+
+def _requested_batch_ids():
+    """certificate_ids from a batch request body, or None when malformed"""
+    payload = request.get_json(silent=True)
+    certificate_ids = payload.get('certificate_ids') if isinstance(payload, dict) else None
+    if not isinstance(certificate_ids, list) or not all(isinstance(cid, str) for cid in certificate_ids):
+        return None
+    return certificate_ids
+
+def _batch_cost():
+    return max(1, len(_requested_batch_ids() or ()))
+
+def _dump_json(obj):
+    """Serialize obj to compact JSON bytes"""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Error bodies have fixed shapes, only the error text and certificate id
+# vary, so the envelope is spliced together from pre-encoded pieces
+_VALID_FALSE_PREFIX = b'{"valid":false,"error":'
+_SUCCESS_FALSE_PREFIX = b'{"success":false,"error":'
+_CERTIFICATE_ID_KEY = b',"certificate_id":'
+MALFORMED_CERTIFICATE_ID = 'Malformed certificate_id'
+
+def _error_response(prefix, error, status, certificate_id=None):
+    """Build a JSON error response without going through the encoder for the envelope"""
+    body = prefix + _dump_json(error)
+    if certificate_id is not None:
+        body += _CERTIFICATE_ID_KEY + _dump_json(certificate_id)
+    return app.response_class(body + b'}', status=status, mimetype='application/json')
+
+def _static_assets_version():
+    """Short content hash of the portal CSS/JS, used to bust browser caches"""
+    digest = hashlib.sha1()
+    for name in ('portal.css', 'portal.js'):
+        with open(os.path.join(app.static_folder, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+# Verification portal page (templates/portal.html), compiled once at import;
+# the plain index page has nothing to fill in
+_VERIFICATION_TPL = app.jinja_env.get_template('portal.html', globals={
+    'static_url': app.static_url_path,
+    'asset_version': _static_assets_version()
+})
+_RENDERED_INDEX = _VERIFICATION_TPL.render()
+
+# Index page bodies compressed once at startup, keyed by Content-Encoding
+_INDEX_HTML = _RENDERED_INDEX.encode('utf-8')
+_INDEX_BODIES = {'identity': _INDEX_HTML, 'gzip': gzip.compress(_INDEX_HTML, 9)}
+if brotli is not None:
+    _INDEX_BODIES['br'] = brotli.compress(_INDEX_HTML, quality=11)
+_INDEX_ETAG = hashlib.sha1(_INDEX_HTML).hexdigest()
+INDEX_CACHE_CONTROL = 'public, max-age=3600, immutable'
+
+def _negotiate_index_encoding():
+    """Pick the best precompressed index body the client accepts"""
+    accepted = request.accept_encodings
+    for encoding in ('br', 'gzip'):
+        if encoding in _INDEX_BODIES and accepted[encoding]:
+            return encoding
+    return 'identity'
 
 @app.route('/')
 def index():
-    return render_template_string(VERIFICATION_TEMPLATE)
+    encoding = _negotiate_index_encoding()
+    response = Response(_INDEX_BODIES[encoding], mimetype='text/html')
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = INDEX_CACHE_CONTROL
+    response.set_etag(f"{_INDEX_ETAG}-{encoding}")
+    return response.make_conditional(request)
 
 @app.route('/verify/<certificate_id>')
 def verify_page(certificate_id):
     """Direct verification page with pre-filled certificate ID"""
-    template = VERIFICATION_TEMPLATE.replace(
-        'placeholder="Enter certificate ID', 
-        f'value="{certificate_id}" placeholder="Enter certificate ID'
-    )
-    return render_template_string(template)
+    return Response(_VERIFICATION_TPL.render(cert_id=certificate_id), mimetype='text/html')
+
+@app.errorhandler(413)
+def payload_too_large(e):
+    return _error_response(_SUCCESS_FALSE_PREFIX, 'Request body too large', 413)
+
+@app.errorhandler(429)
+def rate_limited(e):
+    # Same envelope as the endpoint's other errors
+    prefix = _VALID_FALSE_PREFIX if request.endpoint == 'api_verify_certificate' else _SUCCESS_FALSE_PREFIX
+    certificate_id = (request.view_args or {}).get('certificate_id')
+    return _error_response(prefix, 'Too many requests, slow down', 429, certificate_id)
 
 @app.route('/api/verify/<certificate_id>')
+@_rate_limit(VERIFY_RATE_LIMIT)
 def api_verify_certificate(certificate_id):
     """API endpoint to verify certificate"""
+    if not CERTIFICATE_ID_RE.fullmatch(certificate_id):
+        return _error_response(_VALID_FALSE_PREFIX, MALFORMED_CERTIFICATE_ID, 400, certificate_id)
+    
+    result = _cache_get('verify', certificate_id)
+    if result is not None:
+        return jsonify(result)
+    
+    result = _cached_missing('verify', certificate_id)
+    if result is not None:
+        response = jsonify(result)
+        response.headers['X-Cache'] = 'NEG-HIT'
+        return response
+    
     try:
-        result = cert_system.verify_certificate(certificate_id)
+        result = _coalesced(('verify', certificate_id), lambda: _verify_and_remember(certificate_id))
         return jsonify(result)
     except Exception as e:
-        return jsonify({
-            'valid': False,
-            'error': str(e),
-            'certificate_id': certificate_id
-        }), 500
+        return _error_response(_VALID_FALSE_PREFIX, str(e), 500, certificate_id)
+
+def _batch_lookup(kind, fetch_batch, failure_key):
+    """Answer a batch request from the caches, fetching the misses in one call"""
+    certificate_ids = _requested_batch_ids()
+    
+    if certificate_ids is None:
+        return _error_response(_SUCCESS_FALSE_PREFIX, 'certificate_ids must be a list of strings', 400)
+    
+    if len(certificate_ids) > MAX_BATCH_VERIFY:
+        return _error_response(_SUCCESS_FALSE_PREFIX, f'At most {MAX_BATCH_VERIFY} certificate ids per batch', 400)
+    
+    results = {}
+    for cid in certificate_ids:
+        if not CERTIFICATE_ID_RE.fullmatch(cid):
+            results[cid] = {failure_key: False, 'certificate_id': cid, 'error': MALFORMED_CERTIFICATE_ID}
+        else:
+            results[cid] = _cache_get(kind, cid) or _cached_missing(kind, cid)
+    misses = [cid for cid, result in results.items() if result is None]
+    
+    if misses:
+        try:
+            for cid, result in zip(misses, fetch_batch(misses)):
+                results[cid] = result
+                _remember_lookup(kind, cid, result)
+        except Exception as e:
+            return _error_response(_SUCCESS_FALSE_PREFIX, str(e), 500)
+    
+    return jsonify({
+        'success': True,
+        'results': [results[cid] for cid in certificate_ids]
+    })
+
+@app.route('/api/verify/batch', methods=['POST'])
+@_rate_limit(BATCH_RATE_LIMIT, cost=_batch_cost)
+def api_verify_batch():
+    """API endpoint to verify up to MAX_BATCH_VERIFY certificates at once"""
+    return _batch_lookup('verify', cert_system.verify_certificates_batch, 'valid')
+
+@app.route('/api/details/batch', methods=['POST'])
+@_rate_limit(BATCH_RATE_LIMIT, cost=_batch_cost)
+def api_details_batch():
+    """API endpoint to get details for up to MAX_BATCH_VERIFY certificates at once"""
+    return _batch_lookup('details', cert_system.get_certificate_details_batch, 'success')
 
 @app.route('/api/details/<certificate_id>')
+@_rate_limit(VERIFY_RATE_LIMIT)
 def api_certificate_details(certificate_id):
     """API endpoint to get full certificate details"""
+    if not CERTIFICATE_ID_RE.fullmatch(certificate_id):
+        return _error_response(_SUCCESS_FALSE_PREFIX, MALFORMED_CERTIFICATE_ID, 400, certificate_id)
+    
+    result = _cache_get('details', certificate_id)
+    if result is not None:
+        return jsonify(result)
+    
+    result = _cached_missing('details', certificate_id)
+    if result is not None:
+        response = jsonify(result)
+        response.headers['X-Cache'] = 'NEG-HIT'
+        return response
+    
     try:
-        result = cert_system.get_certificate_details(certificate_id)
+        result = _coalesced(('details', certificate_id), lambda: _details_and_remember(certificate_id))
         return jsonify(result)
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'certificate_id': certificate_id
-        }), 500
+        return _error_response(_SUCCESS_FALSE_PREFIX, str(e), 500, certificate_id)
 
 @app.route('/api/issue', methods=['POST'])
 def api_issue_certificate():
     """API endpoint to issue new certificate"""
+    raw = request.get_data(cache=False)
+    if not raw:
+        return _error_response(_SUCCESS_FALSE_PREFIX, 'No wipe data provided', 400)
+    
+    try:
+        wipe_data = app.json.loads(raw)
+    except ValueError as e:
+        return _error_response(_SUCCESS_FALSE_PREFIX, f'Invalid JSON: {e}', 400)
+    
     try:
-        wipe_data = request.get_json()
-        
         if not wipe_data:
-            return jsonify({
-                'success': False,
-                'error': 'No wipe data provided'
-            }), 400
+            return _error_response(_SUCCESS_FALSE_PREFIX, 'No wipe data provided', 400)
         
         result = cert_system.process_wipe_data(wipe_data)
+        if result.get('success'):
+            # A lookup made before issuance must not keep reporting "not found"
+            _forget_missing(result['certificate_id'])
         return jsonify(result)
         
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return _error_response(_SUCCESS_FALSE_PREFIX, str(e), 500)
+
+@app.route('/api/admin/cache/flush', methods=['POST'])
+def api_flush_cache():
+    """Drop cached lookups, e.g. after a certificate is revoked"""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not admin_token or not hmac.compare_digest(supplied, admin_token):
+        return _error_response(_SUCCESS_FALSE_PREFIX, 'Forbidden', 403)
+    
+    certificate_id = (request.get_json(silent=True) or {}).get('certificate_id')
+    with _cache_lock:
+        for cache in _lookup_caches.values():
+            if certificate_id:
+                cache.pop(certificate_id, None)
+            else:
+                cache.clear()
+        if not certificate_id:
+            _missing_ids.clear()
+    if certificate_id:
+        _forget_missing(certificate_id)
+    
+    client = _redis_client()
+    if client is not None:
+        try:
+            if certificate_id:
+                client.delete(*(_shared_cache_key(kind, certificate_id) for kind in _lookup_caches))
+            else:
+                keys = list(client.scan_iter(match=f"*:{_SHARED_CACHE_NAMESPACE}:*"))
+                if keys:
+                    client.delete(*keys)
+        except redis.RedisError as e:
+            app.logger.warning("Shared cache flush failed: %s", e)
+    
+    return jsonify({'success': True, 'certificate_id': certificate_id})
+
+class _DevRequestHandler(WSGIRequestHandler):
+    """Dev server handler that sends small JSON replies without Nagle delay"""
+    disable_nagle_algorithm = True
 
 if __name__ == '__main__':
+    port = int(os.getenv('PORT', '5000'))
+    debug = os.getenv('FLASK_DEBUG', '0') == '1'
+    
     print("🌐 Starting Certificate Verification Portal...")
-    print("🌐 Access the portal at: http://localhost:5000")
+    print(f"🌐 Access the portal at: http://localhost:{port}")
     print("🌐 API endpoints:")
     print("   - GET  /api/verify/<certificate_id>  : Verify certificate")
+    print("   - POST /api/verify/batch             : Verify up to 100 certificates")
     print("   - GET  /api/details/<certificate_id> : Get certificate details") 
+    print("   - POST /api/details/batch            : Get details for up to 100 certificates")
     print("   - POST /api/issue                    : Issue new certificate")
+    print("   - POST /api/admin/cache/flush        : Flush cached lookups (X-Admin-Token)")
+    print("🌐 For production use: gunicorn -c gunicorn.conf.py wsgi:application")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Debugger and reloader only on request (FLASK_DEBUG=1), never by default
+    app.run(
+        debug=debug,
+        host='0.0.0.0',
+        port=port,
+        threaded=True,
+        use_reloader=debug,
+        request_handler=_DevRequestHandler
+    )
\ No newline at end of file
@@ -0,0 +1,59 @@
+from typing import List, Optional, Union
+
+import msgspec
+
+
+class DeviceDetails(msgspec.Struct):
+    """Wiped device as reported by the wipe engine"""
+    serial: str
+    name: str = ''
+    path: str = ''
+    size: Union[str, int] = ''
+    mountpoint: Optional[str] = None
+    model: str = ''
+
+
+class SystemInfo(msgspec.Struct):
+    """Host the wipe was run on"""
+    hostname: str = ''
+    os: str = ''
+
+
+class CommandResult(msgspec.Struct):
+    """One command executed during the wipe"""
+    cmd: str = ''
+    returncode: Optional[int] = None
+    stdout: str = ''
+    stderr: str = ''
+
+
+class Verification(msgspec.Struct):
+    """Integrity data for the wipe log"""
+    log_hash_sha256: str = ''
+
+
+class WipeData(msgspec.Struct):
+    """Wipe report JSON produced by the core engine"""
+    certificate_id: str
+    device_details: DeviceDetails
+    timestamp_utc: str
+    success: bool
+    status: str
+    wipe_mode: str = ''
+    tool_version: str = ''
+    system_info: SystemInfo = msgspec.field(default_factory=SystemInfo)
+    verification: Verification = msgspec.field(default_factory=Verification)
+    results: List[CommandResult] = []
+    log_file: str = ''
+
+
+# The schema only validates; callers get the report as sent, so unknown
+# fields survive and absent ones keep their downstream 'N/A' fallbacks
+_decoder = msgspec.json.Decoder()
+
+
+def decode_wipe_data(raw):
+    """Parse wipe report JSON and validate it against WipeData, returning a plain dict"""
+    data = _decoder.decode(raw)
+    msgspec.convert(data, WipeData)
+    return data
@@ -0,0 +1,3 @@
+# gunicorn's gevent worker monkey-patches in init_process before loading this
+# module, and the gthread fallback must not be patched at all
+from web_app import app as application
\ No newline at end of file